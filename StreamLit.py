@@ -2,35 +2,34 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 from helpers import (
-    load_trade_data,
-    load_tick_data,
+    get_shared_trades,
+    get_shared_trade_index,
+    select_trade_ranges,
+    get_shared_ohlc_cache,
+    get_shared_trade_bars,
+    get_shared_trade_excursions,
+    slice_ohlc_around_trades,
+    prefetch_timeframes,
     parse_trade_number_input,
     filter_initial_trades,
     group_trades_into_signals,
-    calculate_mean_pips_away,
-    calculate_median_pips_away,
+    calculate_signal_statistics,
+    calculate_basket_curves,
+    calculate_equity_curve,
     create_candlestick_chart,
-    adjust_trade_times,
     calculate_daily_profits,
-    calculate_cumulative_volume,
-    calculate_cumulative_trades_per_signal,
-    calculate_initial_trade_volume,
-    calculate_max_pip_drawdown
+    indicator_lookback,
+    TRADE_BAR_COLUMNS,
+    TRADE_EXCURSION_COLUMNS
 )
 
-def load_all_trades(file_path):
-    """Loads all trade data from a specified CSV file."""
-    return load_trade_data(file_path)
+def load_all_trades(path):
+    """Loads all trade data from a CSV file or a directory of CSV files, shared across sessions and reruns."""
+    return get_shared_trades(path)
 
-def filter_trades(all_trade_data_df, trade_numbers, desired_columns):
-    """Filters the trades based on the input trade numbers."""
-    trade_data_dfs = []
-    for trade_number in trade_numbers:
-        trade_data_df = all_trade_data_df[all_trade_data_df['Trade Number'] == trade_number]
-        if not trade_data_df.empty:
-            trade_data_df = trade_data_df[desired_columns]
-            trade_data_dfs.append(trade_data_df)
-    return trade_data_dfs
+def filter_trades(all_trade_data_df, trade_index, trade_ranges, desired_columns, row_columns=None):
+    """Filters the trades based on the input trade number ranges."""
+    return select_trade_ranges(all_trade_data_df, trade_index, trade_ranges, desired_columns, row_columns)
 
 def get_input_settings():
     """Collects various display and indicator settings from the user."""
@@ -83,46 +82,55 @@ def main():
     try:
         if trade_numbers_input == "":
             raise ValueError("Enter trade number(s)")
-        trade_numbers = parse_trade_number_input(trade_numbers_input)
-        trade_numbers = sorted(set(trade_numbers))
+        trade_ranges = parse_trade_number_input(trade_numbers_input)
     except ValueError as e:
         st.error(f"Invalid input: {e}")
         st.stop()
 
-    selected_timeframe = st.radio("Select Timeframe", ('1M', '5M', '15M', '1H', '4H', '1D'))
-    file_mapping = {
-        '1M': 'GUM1_OHLC_dropnaCSV.csv',
-        '5M': 'GUM5_OHLC_dropnaCSV.csv',
-        '15M': 'GUM15_OHLC_dropnaCSV.csv',
-        '1H': 'GUH1_OHLC_dropnaCSV.csv',
-        '4H': 'GUH4_OHLC_dropnaCSV.csv',
-        '1D': 'GUD1_OHLC_dropnaCSV.csv'
-    }
+    timeframes = ('1M', '5M', '15M', '30M', '1H', '2H', '4H', '1D')
+    selected_timeframe = st.radio("Select Timeframe", timeframes)
     desired_columns = [
         'Trade Number', 'Open DateTime', 'Opening Price', 'Type', 'Volume',
-        'S / L', 'T / P', 'Close DateTime', 'Closing Price', 'Profit'
+        'S / L', 'T / P', 'Close DateTime', 'Closing Price', 'Profit', 'Commission', 'Swap', 'Source'
     ]
 
-    all_trades_file_path = 'trades/trade_0.csv'
-    all_trade_data_df = load_all_trades(all_trades_file_path)
-    trade_data_dfs = filter_trades(all_trade_data_df, trade_numbers, desired_columns)
+    all_trades_path = 'trades'
+    all_trade_data_df = load_all_trades(all_trades_path)
+    trade_index = get_shared_trade_index(all_trades_path)
+    trade_bars = get_shared_trade_bars(all_trades_path, selected_timeframe)
+    trade_excursions = get_shared_trade_excursions(all_trades_path)
+    trade_agg_data = filter_trades(all_trade_data_df, trade_index, trade_ranges, desired_columns, {**trade_bars, **trade_excursions})
 
-    if not trade_data_dfs:
+    if trade_agg_data.empty:
         st.write("No valid trades selected.")
         st.stop()
 
-    tick_data_file_path = file_mapping[selected_timeframe]
-    tf_ohlc_data = load_tick_data(tick_data_file_path)
     input_settings = get_input_settings()
 
-    trade_agg_data = pd.concat(trade_data_dfs).reset_index(drop=True)
     if not input_settings["Showing Hedges"]:
         trade_agg_data = filter_initial_trades(trade_agg_data)
-        trade_agg_data = trade_agg_data[desired_columns]
+        trade_agg_data = trade_agg_data[desired_columns + TRADE_BAR_COLUMNS + TRADE_EXCURSION_COLUMNS]
 
     trade_agg_data = group_trades_into_signals(trade_agg_data)
-    mean_pips_away_df = calculate_mean_pips_away(trade_agg_data)
-    median_pips_away_df = calculate_median_pips_away(trade_agg_data)
+
+    # Load only the bars around the selected trades, plus the warm-up the indicators need
+    warmup_bars = max(
+        indicator_lookback('RSI', input_settings["RSI Length"]) if input_settings["Display RSI?"] else 0,
+        indicator_lookback('Bollinger Bands', input_settings["Bollinger Bands Period"]) if input_settings["Display Bollinger Bands?"] else 0
+    )
+    tf_ohlc_data, trade_agg_data = slice_ohlc_around_trades(
+        get_shared_ohlc_cache(selected_timeframe),
+        trade_agg_data,
+        bars_before=input_settings["Candles Before"] + warmup_bars,
+        bars_after=input_settings["Candles After"]
+    )
+    # Warm the other timeframes while this one is being displayed
+    prefetch_timeframes(selected_timeframe, timeframes)
+    # Calculate the floating P&L of each signal's basket once, for the statistics below
+    basket_curves_df = calculate_basket_curves(trade_agg_data, tf_ohlc_data)
+
+    # Calculate every per-signal aggregate in one pass
+    signal_stats_df = calculate_signal_statistics(trade_agg_data, tf_ohlc_data, basket_curves_df)
 
     # Calculate daily profits
     daily_profits_df = calculate_daily_profits(trade_agg_data)
@@ -131,41 +139,41 @@ def main():
     daily_profit_mean = daily_profits_df['Profit'].mean()
     daily_profit_median = daily_profits_df['Profit'].median()
 
-    # Calculate cumulative volume by signal
-    cumulative_volume_df = calculate_cumulative_volume(trade_agg_data)
+    # Calculate each source's account equity net of commission and swap, and its drawdown
+    equity_curves = {
+        source: calculate_equity_curve(source_trades, tf_ohlc_data)
+        for source, source_trades in trade_agg_data.groupby('Source', sort=True)
+    }
 
     # Calculate statistics for cumulative volume
-    volume_mean = cumulative_volume_df['Volume'].mean()
-    volume_median = cumulative_volume_df['Volume'].median()
-    volume_max = cumulative_volume_df['Volume'].max()
-    volume_min = cumulative_volume_df['Volume'].min()
-
-    # Calculate cumulative trades per signal
-    cumulative_trades_df = calculate_cumulative_trades_per_signal(trade_agg_data)
+    volume_mean = signal_stats_df['Volume'].mean()
+    volume_median = signal_stats_df['Volume'].median()
+    volume_max = signal_stats_df['Volume'].max()
+    volume_min = signal_stats_df['Volume'].min()
 
     # Calculate statistics for cumulative trades per signal
-    trades_mean = cumulative_trades_df['Trade Count'].mean()
-    trades_median = cumulative_trades_df['Trade Count'].median()
-    trades_max = cumulative_trades_df['Trade Count'].max()
-    trades_min = cumulative_trades_df['Trade Count'].min()
-
-    # Calculate initial trade volume per signal
-    initial_trade_volume_df = calculate_initial_trade_volume(trade_agg_data)
+    trades_mean = signal_stats_df['Trade Count'].mean()
+    trades_median = signal_stats_df['Trade Count'].median()
+    trades_max = signal_stats_df['Trade Count'].max()
+    trades_min = signal_stats_df['Trade Count'].min()
 
     # Calculate statistics for initial trade volume per signal
-    initial_volume_mean = initial_trade_volume_df['Volume'].mean()
-    initial_volume_median = initial_trade_volume_df['Volume'].median()
-    initial_volume_max = initial_trade_volume_df['Volume'].max()
-    initial_volume_min = initial_trade_volume_df['Volume'].min()
-
-    # Calculate max pip drawdown for initial trades
-    max_pip_drawdown_df = calculate_max_pip_drawdown(trade_agg_data, tf_ohlc_data)
+    initial_volume_mean = signal_stats_df['Initial Volume'].mean()
+    initial_volume_median = signal_stats_df['Initial Volume'].median()
+    initial_volume_max = signal_stats_df['Initial Volume'].max()
+    initial_volume_min = signal_stats_df['Initial Volume'].min()
 
     # Calculate statistics for max pip drawdown
-    drawdown_mean = max_pip_drawdown_df['Max Pip Drawdown'].mean()
-    drawdown_median = max_pip_drawdown_df['Max Pip Drawdown'].median()
-    drawdown_max = max_pip_drawdown_df['Max Pip Drawdown'].max()
-    drawdown_min = max_pip_drawdown_df['Max Pip Drawdown'].min()
+    drawdown_mean = signal_stats_df['Max Pip Drawdown'].mean()
+    drawdown_median = signal_stats_df['Max Pip Drawdown'].median()
+    drawdown_max = signal_stats_df['Max Pip Drawdown'].max()
+    drawdown_min = signal_stats_df['Max Pip Drawdown'].min()
+
+    # Calculate statistics for max floating loss of the signal baskets
+    floating_loss_mean = signal_stats_df['Max Floating Loss'].mean()
+    floating_loss_median = signal_stats_df['Max Floating Loss'].median()
+    floating_loss_max = signal_stats_df['Max Floating Loss'].max()
+    floating_loss_min = signal_stats_df['Max Floating Loss'].min()
 
     # Display the candlestick chart first
     chart = create_candlestick_chart(tf_ohlc_data, trade_agg_data, selected_timeframe, input_settings)
@@ -173,7 +181,7 @@ def main():
 
     # Display the mean pips away chart
     fig_mean = px.bar(
-        mean_pips_away_df, 
+        signal_stats_df, 
         x='Trade Count', 
         y='Mean Pips Away', 
         title='Mean Pips Away from First Trade in Signal',
@@ -184,7 +192,7 @@ def main():
 
     # Display the median pips away chart
     fig_median = px.bar(
-        median_pips_away_df, 
+        signal_stats_df, 
         x='Trade Count', 
         y='Median Pips Away', 
         title='Median Pips Away from First Trade in Signal',
@@ -208,9 +216,25 @@ def main():
     st.write(f"Mean Daily Profit: ${daily_profit_mean:.2f}")
     st.write(f"Median Daily Profit: ${daily_profit_median:.2f}")
 
+    # Display the equity curve of each source, which are separate accounts
+    for source, equity_curve_df in equity_curves.items():
+        source_suffix = f" - {source}" if len(equity_curves) > 1 else ""
+        fig_equity = px.line(
+            equity_curve_df.reset_index(),
+            x='DateTime',
+            y=['Equity', 'Balance'],
+            title=f'Equity Curve (net of Commission and Swap){source_suffix}'
+        )
+        fig_equity.update_layout(yaxis_title='P&L')
+        st.plotly_chart(fig_equity, use_container_width=True)
+
+        # Display equity drawdown statistics
+        st.write(f"Net P&L{source_suffix}: ${equity_curve_df['Balance'].iloc[-1]:.2f}")
+        st.write(f"Max Equity Drawdown{source_suffix}: ${equity_curve_df['Drawdown'].min():.2f}")
+
     # Display the histogram of cumulative volume
     fig_vol_hist = px.histogram(
-        cumulative_volume_df,
+        signal_stats_df,
         x='Volume',
         nbins=20,
         title='Histogram of Cumulative Volume by Signal'
@@ -226,7 +250,7 @@ def main():
 
     # Display the histogram of cumulative trades per signal
     fig_trades_hist = px.histogram(
-        cumulative_trades_df,
+        signal_stats_df,
         x='Trade Count',
         nbins=20,
         title='Histogram of Cumulative Trades per Signal'
@@ -242,8 +266,8 @@ def main():
 
     # Display the histogram of initial trade volume per signal
     fig_initial_vol_hist = px.histogram(
-        initial_trade_volume_df,
-        x='Volume',
+        signal_stats_df,
+        x='Initial Volume',
         nbins=20,
         title='Histogram of Initial Trade Volume by Signal'
     )
@@ -258,7 +282,7 @@ def main():
 
     # Display the histogram of max pip drawdown per signal
     fig_drawdown_hist = px.histogram(
-        max_pip_drawdown_df,
+        signal_stats_df,
         x='Max Pip Drawdown',
         nbins=20,
         title='Histogram of Max Pip Drawdown by Signal'
@@ -272,11 +296,27 @@ def main():
     st.write(f"Maximum Max Pip Drawdown: {drawdown_max:.2f}")
     st.write(f"Minimum Max Pip Drawdown: {drawdown_min:.2f}")
 
+    # Display the histogram of max floating loss per signal basket
+    fig_floating_loss_hist = px.histogram(
+        signal_stats_df,
+        x='Max Floating Loss',
+        nbins=20,
+        title='Histogram of Max Floating Loss by Signal Basket'
+    )
+    fig_floating_loss_hist.update_layout(yaxis_title='Number of Signals')
+    st.plotly_chart(fig_floating_loss_hist, use_container_width=True)
+
+    # Display max floating loss statistics
+    st.write(f"Mean Max Floating Loss: ${floating_loss_mean:.2f}")
+    st.write(f"Median Max Floating Loss: ${floating_loss_median:.2f}")
+    st.write(f"Maximum Max Floating Loss: ${floating_loss_max:.2f}")
+    st.write(f"Minimum Max Floating Loss: ${floating_loss_min:.2f}")
+
     if input_settings["Showing Hedges"]:
         average_price_data_df = calculate_average_prices(trade_agg_data)
         st.table(average_price_data_df)
 
-    st.table(trade_agg_data)
+    st.table(trade_agg_data.drop(columns=TRADE_BAR_COLUMNS))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,137 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from helpers import OHLC_FILES, convert_trade_export, ingest_appended_bars, _file_content_hash, _replace_file
+
+# Content hashes of every target's inputs and output as of its last successful build.
+BUILD_STATE_FILE = '.build_state.json'
+# Bump to rebuild every target after changing how outputs are produced.
+BUILD_VERSION = 1
+
+def build_targets():
+    """
+    Returns the build graph: one target per output file, with the files it is built from and the action building it.
+    A target whose inputs include another target's output is only built after that target.
+    The converted OHLC files come from the raw Date,Time exports (e.g. GUM5.csv -> GUM5_OHLC_dropnaCSV.csv),
+    and the first trade file comes from the combined broker export.
+    """
+    targets = {}
+    for file_name in OHLC_FILES.values():
+        raw_file_name = file_name.replace('_OHLC_dropnaCSV', '')
+        targets[file_name] = {'inputs': [raw_file_name], 'action': 'ohlc'}
+    targets[os.path.join('trades', 'trade_0.csv')] = {'inputs': ['Combined_GU_trades.csv'], 'action': 'trades'}
+    return targets
+
+def run_action(action, input_paths, output_path, incremental=False):
+    """
+    Builds one output file. Runs in a worker process.
+    An incremental OHLC build appends only the new bars when the raw export has grown, and converts it again otherwise;
+    any other build converts the whole export.
+    """
+    if action == 'ohlc':
+        ingest_appended_bars(input_paths[0], output_path, full=not incremental)
+    elif action == 'trades':
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        convert_trade_export(input_paths[0], output_path)
+    else:
+        raise ValueError(f"Unknown build action: {action}")
+    return output_path
+
+def read_build_state(state_path):
+    try:
+        with open(state_path) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return state if state.get('version') == BUILD_VERSION else {}
+
+def write_build_state(state_path, state):
+    _replace_file(state_path, lambda f: json.dump({**state, 'version': BUILD_VERSION}, f, indent=2), 'w')
+
+def is_output_intact(output_path, recorded):
+    """An output is intact when it was built before, still exists and has not been modified since its last build."""
+    return recorded is not None and os.path.exists(output_path) and recorded['output'] == _file_content_hash(output_path)
+
+def build(targets, state_path=BUILD_STATE_FILE, force=False, max_workers=None, dry_run=False):
+    """
+    Builds every out-of-date target of the graph, running independent targets in parallel worker processes.
+    A target is out of date when forced, when it was never built, when an input's content hash changed
+    or when its output was edited; targets depending on a rebuilt target are then rebuilt as well.
+    Args:
+        targets (dict): Build graph as returned by build_targets.
+        state_path (str): File recording the content hashes of each target's last build.
+        force (bool): Whether to rebuild every target.
+        max_workers (int): Maximum number of worker processes. Defaults to the number of processors.
+        dry_run (bool): Whether to only report the targets that would be built.
+    Returns:
+        list: Output paths that were (or, for a dry run, would be) built, in completion order.
+    """
+    state = read_build_state(state_path)
+    recorded = state.get('targets', {})
+    pending = dict(targets)
+    built = []
+    running = {}
+
+    def ready(output_path):
+        return not any(input_path in pending or input_path in running.values() for input_path in targets[output_path]['inputs'])
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        while pending or running:
+            for output_path in [output_path for output_path in pending if ready(output_path)]:
+                target = pending.pop(output_path)
+                missing = [input_path for input_path in target['inputs'] if not os.path.exists(input_path)]
+                if missing:
+                    raise FileNotFoundError(f"Inputs of {output_path} not found: {', '.join(missing)}")
+                input_hashes = {input_path: _file_content_hash(input_path) for input_path in target['inputs']}
+                stale_inputs = any(input_path in built for input_path in target['inputs'])
+                # Only an intact output can be brought up to date in place; a forced, new or edited one is rebuilt whole
+                incremental = not force and is_output_intact(output_path, recorded.get(output_path))
+                if incremental and not stale_inputs and recorded[output_path]['inputs'] == input_hashes:
+                    continue
+                if dry_run:
+                    built.append(output_path)
+                    continue
+                future = executor.submit(run_action, target['action'], target['inputs'], output_path, incremental)
+                future.input_hashes = input_hashes
+                running[future] = output_path
+            if not running:
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                output_path = running.pop(future)
+                future.result()
+                recorded[output_path] = {'inputs': future.input_hashes, 'output': _file_content_hash(output_path)}
+                # Saved after every target so an interrupted build keeps the work already done
+                write_build_state(state_path, {'targets': recorded})
+                built.append(output_path)
+    return built
+
+def main():
+    parser = argparse.ArgumentParser(description='Converts the raw OHLC exports and the trade export into the files the dashboard reads, rebuilding only what changed.')
+    parser.add_argument('targets', nargs='*', help='Output files to build. Defaults to all of them.')
+    parser.add_argument('--force', action='store_true', help='Rebuild targets even if their inputs did not change.')
+    parser.add_argument('--jobs', type=int, default=None, help='Number of worker processes.')
+    parser.add_argument('--dry-run', action='store_true', help='Only list the targets that are out of date.')
+    args = parser.parse_args()
+    # Inputs and outputs are named relative to the repository root
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+    targets = build_targets()
+    if args.targets:
+        unknown = [output_path for output_path in args.targets if output_path not in targets]
+        if unknown:
+            parser.error(f"Unknown targets: {', '.join(unknown)}")
+        targets = {output_path: targets[output_path] for output_path in args.targets}
+
+    start = time.perf_counter()
+    built = build(targets, force=args.force, max_workers=args.jobs, dry_run=args.dry_run)
+    verb = 'Out of date' if args.dry_run else 'Built'
+    for output_path in built:
+        print(f"{verb}: {output_path}")
+    print(f"{len(built)} of {len(targets)} targets {'out of date' if args.dry_run else 'rebuilt'} in {time.perf_counter() - start:.2f} s")
+
+if __name__ == "__main__":
+    main()
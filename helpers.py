@@ -1,86 +1,1099 @@
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import datetime
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from html.parser import HTMLParser
+from numpy.lib.stride_tricks import sliding_window_view
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import glob
+
+OHLC_CACHE_DIR = '.ohlc_cache'
+OHLC_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# Bump whenever the transformation applied before caching changes, so existing caches are rebuilt.
+_OHLC_CACHE_VERSION = 5
+
+# OHLC bars are exported in UTC and trade times in the broker's server time (EET/EEST). Both are
+# normalized to London time, the session the charts and statistics are read in.
+OHLC_SOURCE_TIMEZONE = 'UTC'
+TRADE_SOURCE_TIMEZONE = 'Europe/Helsinki'
+DISPLAY_TIMEZONE = 'Europe/London'
+
+TIMEFRAME_MINUTES = {
+    '1M': 1,
+    '5M': 5,
+    '15M': 15,
+    '30M': 30,
+    '1H': 60,
+    '2H': 120,
+    '4H': 240,
+    '1D': 1440
+}
+OHLC_FILES = {
+    '1M': 'GUM1_OHLC_dropnaCSV.csv',
+    '5M': 'GUM5_OHLC_dropnaCSV.csv',
+    '15M': 'GUM15_OHLC_dropnaCSV.csv',
+    '1H': 'GUH1_OHLC_dropnaCSV.csv',
+    '4H': 'GUH4_OHLC_dropnaCSV.csv',
+    '1D': 'GUD1_OHLC_dropnaCSV.csv'
+}
+# Timeframes without an exported file are resampled from this one.
+BASE_TIMEFRAME = '1M'
+
+# Number of decimals each symbol is quoted with. Compact frames store prices as integer multiples of the last
+# decimal (pipettes); a pip is always 10 pipettes.
+PRICE_DIGITS = {'GBPUSD': 5}
+DEFAULT_SYMBOL = 'GBPUSD'
+PIPETTES_PER_PIP = 10
+# Units of the base currency in one lot, used to value price moves in the quote currency.
+CONTRACT_SIZES = {'GBPUSD': 100000}
+OHLC_PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+TRADE_PRICE_COLUMNS = ['Opening Price', 'S / L', 'T / P', 'Closing Price']
+
+# Column types of the converted *_OHLC_dropnaCSV.csv files and of the raw Date,Time exports such as GUM5.csv.
+OHLC_CSV_DTYPES = {'Open': 'float64', 'High': 'float64', 'Low': 'float64', 'Close': 'float64', 'Volume': 'int64'}
+RAW_OHLC_CSV_DTYPES = {'Date': 'int64', 'Time': 'object', **OHLC_CSV_DTYPES}
+
+# Trade times parsed and converted per chunk, bounding the temporaries of pd.to_datetime and the time zone conversion.
+TRADE_TIME_CHUNK_ROWS = 1 << 16
+
+# Upper bound of open-ended trade number ranges such as '100-'.
+MAX_TRADE_NUMBER = np.iinfo(np.int64).max
+
+# Row positions of each trade in a timeframe's bars: the bar containing the open, the first bar starting at or after
+# the open, and the bar containing the close. A position of -1 means the time is before the first bar.
+TRADE_BAR_COLUMNS = ['Open Bar', 'First Bar', 'Close Bar']
+
+# Number of bars per block of a range-extreme index; ranges within one block are reduced directly.
+RANGE_INDEX_BLOCK_SIZE = 64
+
+# Excursions are measured on the finest exported bars covering each trade, so they do not depend on the chart timeframe.
+# The M1 export only spans the last months; older trades fall back to the next-finest timeframe spanning them.
+EXCURSION_TIMEFRAMES = sorted(OHLC_FILES, key=TIMEFRAME_MINUTES.get)
+# Signed pips from the opening price to the worst and best price while a trade was open, and the time from its open
+# to the first bar reaching each of them.
+TRADE_EXCURSION_COLUMNS = ['MAE Pips', 'MFE Pips', 'Time to MAE', 'Time to MFE']
+
+# Bars of at least this many minutes are cut at midnight of OHLC_SOURCE_TIMEZONE, like the exported H4 and D1 bars,
+# so in London summer time they start at 01:00, 05:00 and so on. Shorter bars divide an hour and start on it in any zone.
+SESSION_ANCHOR_MINUTES = 120
 
 def parse_trade_number_input(input_string):
     """
-    Parses the trade number input string and returns a list of trade numbers.
-    Supports individual numbers and ranges (e.g., '0-19, 24-25, 98').
+    Parses the trade number input string and returns the selected trade numbers as a compact range set.
+    Supports individual numbers, ranges, open-ended ranges, stepped ranges and 'all'
+    (e.g., '0-19, 24-25, 98', '100-', '0-1000:10', 'all').
+    Returns:
+        np.ndarray: int64 array of shape (n, 3) with one inclusive [start, end, step] row per range.
+        Overlapping and adjacent ranges with a step of 1 are merged.
     """
-    trade_numbers = []
+    ranges = []
     for part in input_string.split(','):
+        part = part.strip()
+        if part.lower() == 'all':
+            ranges.append((0, MAX_TRADE_NUMBER, 1))
+            continue
+        part, _, step = part.partition(':')
+        step = int(step) if step else 1
+        if step < 1:
+            raise ValueError(f"Invalid step: {step}. Step must be at least 1.")
         if '-' in part:
-            start, end = map(int, part.split('-'))
+            start, end = part.split('-')
+            start = int(start)
+            end = int(end) if end.strip() else MAX_TRADE_NUMBER
             if start > end:
                 raise ValueError(f"Invalid range: {start}-{end}. Start must be less than end.")
-            trade_numbers.extend(range(start, end + 1))
         else:
-            trade_numbers.append(int(part.strip()))
-    return trade_numbers
+            start = end = int(part)
+        ranges.append((start, end, step if end > start else 1))
+    return merge_trade_ranges(np.array(ranges, dtype=np.int64).reshape(-1, 3))
+
+def merge_trade_ranges(ranges):
+    """Merges the overlapping and adjacent step-1 rows of a range set; stepped ranges are kept as they are."""
+    stepped = ranges[ranges[:, 2] != 1]
+    contiguous = ranges[ranges[:, 2] == 1]
+    contiguous = contiguous[np.argsort(contiguous[:, 0], kind='stable')]
+    if len(contiguous):
+        # A range starts a new group unless it overlaps or touches the furthest end seen so far
+        furthest_end = np.maximum.accumulate(contiguous[:, 1])
+        new_group = np.concatenate(([True], contiguous[1:, 0] > np.minimum(furthest_end[:-1], MAX_TRADE_NUMBER - 1) + 1))
+        group_ends = np.append(np.flatnonzero(new_group)[1:], len(contiguous)) - 1
+        contiguous = np.column_stack((contiguous[new_group, 0], furthest_end[group_ends], np.ones(new_group.sum(), dtype=np.int64)))
+    return np.concatenate((contiguous, stepped))
 
-def load_tick_data(file_path):
+def convert_timezone(datetimes, source_tz, target_tz):
     """
-    Loads tick data (OHLC data) from a CSV file, adjusts for daylight saving time, and sets the DateTime column as the index.
+    Converts naive wall-clock datetimes from one time zone to another.
+    The UTC offsets come from the tz database's transition table and are applied to the whole array at once,
+    so every daylight saving switch is handled, not just a single hard-coded date.
+    Times that are ambiguous in the source zone (the repeated hour when clocks go back) are read as standard time,
+    and times that do not exist (the skipped hour) are moved forward to the first valid time.
+    Args:
+        datetimes (array-like): Naive datetimes in the source time zone.
+        source_tz (str): Time zone the datetimes are recorded in, e.g. 'UTC'.
+        target_tz (str): Time zone to express the datetimes in, e.g. 'Europe/London'.
+    Returns:
+        pd.DatetimeIndex: Naive datetimes in the target time zone.
     """
-    tf_ohlc_data = pd.read_csv(file_path)
-    tf_ohlc_data['DateTime'] = pd.to_datetime(tf_ohlc_data['DateTime'])
+    datetimes = pd.DatetimeIndex(datetimes)
+    if source_tz == target_tz:
+        return datetimes
+    localized = datetimes.tz_localize(source_tz, ambiguous=np.zeros(len(datetimes), dtype=bool), nonexistent='shift_forward')
+    return localized.tz_convert(target_tz).tz_localize(None)
+
+def _file_signature(file_path):
+    """Returns the size and modification time of a file, used as the cheap half of a cache key."""
+    stat = os.stat(file_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+def _file_content_hash(file_path, chunk_size=1 << 20):
+    """Returns the SHA-1 hex digest of a file's contents, read in chunks."""
+    digest = hashlib.sha1()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
 
-    # Adjust for daylight saving time starting from 2024-03-31
-    dst_start = pd.Timestamp('2024-03-31 00:00:00')
-    tf_ohlc_data['DateTime'] = tf_ohlc_data['DateTime'].apply(lambda dt: dt + pd.Timedelta(hours=1) if dt >= dst_start else dt)
+def _ohlc_cache_path(file_path):
+    """Returns the cache directory for an OHLC CSV file, next to the file itself."""
+    directory, file_name = os.path.split(os.path.abspath(file_path))
+    return os.path.join(directory, OHLC_CACHE_DIR, os.path.splitext(file_name)[0])
 
-    tf_ohlc_data.set_index('DateTime', inplace=True)
+def _read_cache_manifest(cache_path):
+    try:
+        with open(os.path.join(cache_path, 'manifest.json')) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _replace_file(path, write, mode='wb'):
+    """
+    Writes a file through write(f) into a uniquely named temporary file next to path and renames it over path, so
+    readers never see a partial file and concurrent writers of the same path never share a temporary file.
+    """
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or os.curdir, prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode) as f:
+            write(f)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+def _write_cache_manifest(cache_path, manifest):
+    _replace_file(os.path.join(cache_path, 'manifest.json'), lambda f: json.dump(manifest, f, indent=2), 'w')
+
+# One lock per cache directory, so timeframes that share a cache (e.g. 1M, 30M and 2H all read the GUM1 cache)
+# check and rebuild it once instead of racing on the same files.
+_cache_locks = {}
+_cache_locks_lock = threading.Lock()
+
+def _cache_lock(cache_path):
+    with _cache_locks_lock:
+        return _cache_locks.setdefault(cache_path, threading.Lock())
+
+def _is_cache_fresh(cache_path, manifest, file_path):
+    """
+    Checks a cache manifest against the source file.
+    Size and mtime are compared first; the content hash is only computed when they differ,
+    so a touched but unchanged file refreshes the manifest instead of triggering a rebuild.
+    """
+    if manifest is None or manifest.get('version') != _OHLC_CACHE_VERSION:
+        return False
+    signature = _file_signature(file_path)
+    if signature == manifest['signature']:
+        return True
+    if signature['size'] != manifest['signature']['size']:
+        return False
+    if _file_content_hash(file_path) != manifest['sha1']:
+        return False
+    manifest['signature'] = signature
+    _write_cache_manifest(cache_path, manifest)
+    return True
+
+def _save_column(partition_path, name, values):
+    # Write to a temporary file and rename, so readers holding a memory map of the old file are unaffected.
+    _replace_file(os.path.join(partition_path, name + '.npy'), lambda f: np.save(f, values))
+
+def _write_ohlc_cache(cache_path, tf_ohlc_data, file_path):
+    """
+    Stores the OHLC frame as one directory per calendar month, each holding a .npy file per column,
+    and records the source file's key and the partition boundaries in the manifest.
+    """
+    signature = _file_signature(file_path)
+    sha1 = _file_content_hash(file_path)
+    os.makedirs(cache_path, exist_ok=True)
+    _write_cache_manifest(cache_path, {
+        'version': _OHLC_CACHE_VERSION,
+        'source': os.path.basename(file_path),
+        'signature': signature,
+        'sha1': sha1,
+        'columns': list(tf_ohlc_data.columns),
+        'dtypes': {'DateTime': str(tf_ohlc_data.index.dtype), **{column: str(dtype) for column, dtype in tf_ohlc_data.dtypes.items()}},
+        'rows': len(tf_ohlc_data),
+        'partitions': _write_ohlc_partitions(cache_path, tf_ohlc_data)
+    })
+
+def _write_ohlc_partitions(cache_path, tf_ohlc_data):
+    """
+    Writes one partition directory per calendar month of tf_ohlc_data and returns their manifest entries.
+    An empty frame gets no partitions.
+    """
+    datetimes = tf_ohlc_data.index.values
+    months = datetimes.astype('datetime64[M]')
+    if len(datetimes) == 0:
+        return []
+    boundaries = np.concatenate(([0], np.flatnonzero(months[1:] != months[:-1]) + 1, [len(datetimes)]))
+
+    partitions = []
+    for start, end in zip(boundaries[:-1], boundaries[1:]):
+        name = str(months[start])
+        partition_path = os.path.join(cache_path, name)
+        os.makedirs(partition_path, exist_ok=True)
+        _save_column(partition_path, 'DateTime', datetimes[start:end])
+        for column in tf_ohlc_data.columns:
+            _save_column(partition_path, column, tf_ohlc_data[column].values[start:end])
+        partitions.append({
+            'name': name,
+            'start': str(datetimes[start]),
+            'end': str(datetimes[end - 1]),
+            'rows': int(end - start)
+        })
+    return partitions
+
+def _load_partition_column(cache_path, partition, name):
+    return np.load(os.path.join(cache_path, partition['name'], name + '.npy'), mmap_mode='r')
+
+def _read_ohlc_rows(cache_path, manifest, start_row, end_row, columns=None):
+    """
+    Reads rows [start_row, end_row) of a partitioned OHLC cache, touching only the partitions that overlap them.
+    A range inside a single partition stays memory-mapped; otherwise only the overlapping partitions are concatenated.
+    A cache without partitions reads as an empty frame with the dtypes recorded in the manifest.
+    Only the given columns are read, all of them by default; the DateTime index is always read.
+    """
+    columns = manifest['columns'] if columns is None else columns
+    partitions = manifest['partitions']
+    if not partitions:
+        dtypes = manifest['dtypes']
+        index = pd.DatetimeIndex(np.empty(0, dtype=dtypes['DateTime']), name='DateTime')
+        return pd.DataFrame({column: np.empty(0, dtype=dtypes[column]) for column in columns}, index=index)
+    offsets = np.cumsum([0] + [partition['rows'] for partition in partitions])
+    end_row = max(end_row, start_row)
+    first = max(np.searchsorted(offsets, start_row, side='right') - 1, 0)
+    last = max(np.searchsorted(offsets, end_row - 1, side='right') - 1, first)
+    selected = partitions[first:last + 1]
+    row_slice = slice(start_row - offsets[first], end_row - offsets[first])
+
+    def read_column(name):
+        arrays = [_load_partition_column(cache_path, partition, name) for partition in selected]
+        values = arrays[0] if len(arrays) == 1 else np.concatenate(arrays)
+        return values[row_slice]
+
+    index = pd.DatetimeIndex(read_column('DateTime'), name='DateTime')
+    return pd.DataFrame({column: read_column(column) for column in columns}, index=index, copy=False)
+
+def _locate_datetime_row(cache_path, manifest, dt, side):
+    """Returns the global row position at which dt would be inserted into the cached DateTime column."""
+    partitions = manifest['partitions']
+    ends = pd.DatetimeIndex([partition['end'] for partition in partitions])
+    # The first partition whose last bar is not before dt (or after dt, for side='right') contains the position.
+    target = ends.searchsorted(dt, side=side)
+    offset = sum(partition['rows'] for partition in partitions[:target])
+    if target == len(partitions):
+        return offset
+    datetimes = _load_partition_column(cache_path, partitions[target], 'DateTime')
+    return offset + int(np.searchsorted(datetimes, np.datetime64(dt), side=side))
+
+def _ensure_ohlc_cache(file_path):
+    """Returns the cache directory and manifest for an OHLC CSV file, rebuilding the cache if it is stale."""
+    cache_path = _ohlc_cache_path(file_path)
+    with _cache_lock(cache_path):
+        manifest = _read_cache_manifest(cache_path)
+        if not _is_cache_fresh(cache_path, manifest, file_path):
+            _write_ohlc_cache(cache_path, _parse_tick_data(file_path), file_path)
+            manifest = _read_cache_manifest(cache_path)
+    return cache_path, manifest
+
+def _default_csv_engine():
+    """Returns 'pyarrow' when pyarrow is installed, which parses CSV files on several threads, and 'c' otherwise."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return 'c'
+    return 'pyarrow'
+
+def _time_strings_to_seconds(times):
+    """Converts 'HH:MM:SS' strings to seconds since midnight with integer arithmetic on the digits."""
+    digits = np.asarray(times, dtype=object).astype('S8').view(np.uint8).reshape(-1, 8).astype(np.int64) - ord('0')
+    return (digits[:, 0] * 10 + digits[:, 1]) * 3600 + (digits[:, 3] * 10 + digits[:, 4]) * 60 + digits[:, 6] * 10 + digits[:, 7]
+
+def _combine_date_time(dates, seconds):
+    """Combines yyyymmdd integer dates and seconds since midnight into datetimes."""
+    dates = np.asarray(dates, dtype=np.int64)
+    months = (dates // 10000 - 1970) * 12 + dates // 100 % 100 - 1
+    days = months.astype('datetime64[M]').astype('datetime64[D]') + (dates % 100 - 1)
+    return days.astype('datetime64[s]') + np.asarray(seconds, dtype=np.int64).astype('timedelta64[s]')
+
+def read_ohlc_csv(file_path, engine=None):
+    """
+    Reads an OHLC CSV file with a declared schema instead of letting pandas infer column types and datetime formats.
+    Handles both the converted files with a single DateTime column (e.g. GUM5_OHLC_dropnaCSV.csv) and the raw exports
+    with separate Date and Time columns (e.g. GUM5.csv). Times are returned as recorded, without time zone conversion.
+    Args:
+        file_path (str): Path to the OHLC CSV file.
+        engine (str, optional): 'pyarrow' for the multithreaded Arrow parser or 'c' for the pandas C parser.
+            Defaults to 'pyarrow' when pyarrow is installed and to 'c' otherwise.
+    Returns:
+        pd.DataFrame: DataFrame with Open, High, Low, Close and Volume columns indexed by DateTime.
+    """
+    engine = engine or _default_csv_engine()
+    with open(file_path) as f:
+        header = f.readline().strip().lstrip('\ufeff').split(',')
+    raw_format = 'DateTime' not in header
+
+    if engine == 'pyarrow':
+        # Keep the Arrow types (timestamp, time32) so datetimes convert to NumPy without going through Python objects
+        raw = pd.read_csv(file_path, engine='pyarrow', dtype_backend='pyarrow')
+        if raw_format:
+            datetimes = _combine_date_time(raw['Date'].to_numpy(dtype=np.int64), raw['Time'].astype('int32[pyarrow]').to_numpy())
+        else:
+            datetimes = raw['DateTime'].astype('timestamp[s][pyarrow]').to_numpy(dtype='datetime64[s]')
+    elif raw_format:
+        raw = pd.read_csv(file_path, dtype=RAW_OHLC_CSV_DTYPES, engine=engine)
+        datetimes = _combine_date_time(raw['Date'], _time_strings_to_seconds(raw['Time']))
+    else:
+        raw = pd.read_csv(file_path, dtype=OHLC_CSV_DTYPES, engine=engine)
+        # ISO 8601 strings, with or without a time of day, parsed by NumPy's fixed-format reader
+        datetimes = raw['DateTime'].to_numpy(dtype=object).astype('datetime64[s]')
+
+    columns = {column: raw[column].to_numpy(dtype=dtype) for column, dtype in OHLC_CSV_DTYPES.items()}
+    return pd.DataFrame(columns, index=pd.DatetimeIndex(datetimes, name='DateTime'))
+
+def _parse_tick_data(file_path):
+    """
+    Parses tick data (OHLC data) from a CSV file, adjusts for daylight saving time, and sets the DateTime column as the index.
+    """
+    tf_ohlc_data = read_ohlc_csv(file_path)
+    tf_ohlc_data.index = convert_timezone(tf_ohlc_data.index, OHLC_SOURCE_TIMEZONE, DISPLAY_TIMEZONE).rename('DateTime')
+    return tf_ohlc_data
+
+def price_scale(symbol=DEFAULT_SYMBOL):
+    """Returns the number of pipettes per unit of price for a symbol, e.g. 100000 for GBPUSD."""
+    return 10 ** PRICE_DIGITS[symbol.upper()]
+
+def to_pipettes(prices, symbol=DEFAULT_SYMBOL):
+    """
+    Converts prices to integer pipettes. Integer input is assumed to be in pipettes already.
+    Args:
+        prices (array-like): Prices as floats, or pipettes as integers.
+        symbol (str): Symbol the prices are quoted for.
+    Returns:
+        np.ndarray: int64 array of pipettes.
+    """
+    prices = np.asarray(prices)
+    if np.issubdtype(prices.dtype, np.integer):
+        return prices.astype(np.int64)
+    return np.rint(prices * price_scale(symbol)).astype(np.int64)
+
+def compact_prices(df, columns, symbol=DEFAULT_SYMBOL):
+    """
+    Returns a copy of df with the given price columns stored as int32 pipettes, halving their memory.
+    The scale is recorded in df.attrs['price_scale'] so the prices can be converted back.
+    """
+    df = df.assign(**{column: to_pipettes(df[column], symbol).astype(np.int32) for column in columns if column in df})
+    df.attrs['price_scale'] = price_scale(symbol)
+    return df
+
+def load_tick_data(file_path, use_cache=True, compact=False, symbol=DEFAULT_SYMBOL):
+    """
+    Loads tick data (OHLC data) from a CSV file, adjusts for daylight saving time, and sets the DateTime column as the index.
+    The parsed columns are cached as monthly partitions of .npy files in OHLC_CACHE_DIR next to the CSV, keyed on the
+    file's size, mtime and content hash. Later loads memory-map the cached columns; a stale cache is rebuilt automatically.
+    Args:
+        file_path (str): Path to the OHLC CSV file.
+        use_cache (bool): Whether to read from and write to the columnar cache.
+        compact (bool): Whether to store Open, High, Low and Close as int32 pipettes instead of float64.
+        symbol (str): Symbol the prices are quoted for, used to scale compact prices.
+    Returns:
+        pd.DataFrame: DataFrame with Open, High, Low, Close and Volume columns indexed by DateTime.
+    """
+    if not use_cache:
+        tf_ohlc_data = _parse_tick_data(file_path)
+    else:
+        cache_path, manifest = _ensure_ohlc_cache(file_path)
+        tf_ohlc_data = _read_ohlc_rows(cache_path, manifest, 0, manifest['rows'])
+
+    if compact:
+        tf_ohlc_data = compact_prices(tf_ohlc_data, OHLC_PRICE_COLUMNS, symbol)
     return tf_ohlc_data
 
-def load_trade_data(file_path):
+def timeframe_to_minutes(timeframe):
+    """Returns the bar length in minutes of a timeframe label such as '5M', '2H' or '1D'."""
+    if timeframe in TIMEFRAME_MINUTES:
+        return TIMEFRAME_MINUTES[timeframe]
+    count, unit = timeframe[:-1], timeframe[-1:].upper()
+    if not count.isdigit() or unit not in ('M', 'H', 'D') or int(count) == 0:
+        raise ValueError(f"Invalid timeframe: {timeframe}. Expected a number followed by M, H or D.")
+    minutes = int(count) * {'M': 1, 'H': 60, 'D': 1440}[unit]
+    if minutes > 1440:
+        raise ValueError(f"Invalid timeframe: {timeframe}. Bars longer than a day are not supported.")
+    return minutes
+
+def resample_ohlc(tf_ohlc_data, timeframe_minutes):
+    """
+    Aggregates OHLC bars into a longer timeframe.
+    Bars are bucketed on the same boundaries as align_datetimes_to_candles, so bars of SESSION_ANCHOR_MINUTES or longer
+    are cut at midnight of OHLC_SOURCE_TIMEZONE like the exported H4 and D1 bars, and each bucket is reduced with one
+    vectorized pass per column over the sorted input.
+    Args:
+        tf_ohlc_data (pd.DataFrame): OHLC data indexed by DateTime, sorted ascending.
+        timeframe_minutes (int): Length of the output bars in minutes.
+    Returns:
+        pd.DataFrame: Resampled OHLC data indexed by the start of each bar.
+    """
+    buckets = align_datetimes_to_candles(tf_ohlc_data.index, timeframe_minutes).values
+    starts = np.flatnonzero(np.concatenate(([True], buckets[1:] != buckets[:-1])))
+    ends = np.append(starts[1:], len(buckets)) - 1
+
+    index = pd.DatetimeIndex(buckets[starts], name='DateTime')
+    return pd.DataFrame({
+        'Open': tf_ohlc_data['Open'].values[starts],
+        'High': np.maximum.reduceat(tf_ohlc_data['High'].values, starts),
+        'Low': np.minimum.reduceat(tf_ohlc_data['Low'].values, starts),
+        'Close': tf_ohlc_data['Close'].values[ends],
+        'Volume': np.add.reduceat(tf_ohlc_data['Volume'].values, starts)
+    }, index=index)
+
+def _ensure_resampled_cache(timeframe):
+    """
+    Returns the cache directory and manifest for a timeframe resampled from BASE_TIMEFRAME.
+    The cache is keyed on the base file, so it is rebuilt whenever the base data changes.
+    """
+    base_file_path = OHLC_FILES[BASE_TIMEFRAME]
+    cache_path = _ohlc_cache_path(base_file_path) + '@' + timeframe
+    with _cache_lock(cache_path):
+        manifest = _read_cache_manifest(cache_path)
+        if not _is_cache_fresh(cache_path, manifest, base_file_path):
+            resampled = resample_ohlc(load_tick_data(base_file_path), timeframe_to_minutes(timeframe))
+            _write_ohlc_cache(cache_path, resampled, base_file_path)
+            manifest = _read_cache_manifest(cache_path)
+    return cache_path, manifest
+
+def _ensure_timeframe_cache(timeframe):
+    if timeframe in OHLC_FILES:
+        return _ensure_ohlc_cache(OHLC_FILES[timeframe])
+    return _ensure_resampled_cache(timeframe)
+
+def load_ohlc(timeframe, start=None, end=None, bars_before=0, bars_after=0):
+    """
+    Loads the OHLC bars of a timeframe between two datetimes, reading only the monthly cache partitions that overlap them.
+    Timeframes without an exported file in OHLC_FILES (e.g. '30M' or '2H') are resampled from BASE_TIMEFRAME and cached.
+    Args:
+        timeframe (str): Timeframe label, e.g. '5M'.
+        start (datetime-like, optional): First datetime to include. Defaults to the start of the data.
+        end (datetime-like, optional): Last datetime to include. Defaults to the end of the data.
+        bars_before (int): Number of extra bars to include before start, e.g. for indicator warm-up.
+        bars_after (int): Number of extra bars to include after end.
+    Returns:
+        pd.DataFrame: DataFrame with Open, High, Low, Close and Volume columns indexed by DateTime.
+    """
+    cache_path, manifest = _ensure_timeframe_cache(timeframe)
+    start_row = 0 if start is None else _locate_datetime_row(cache_path, manifest, pd.Timestamp(start), 'left')
+    end_row = manifest['rows'] if end is None else _locate_datetime_row(cache_path, manifest, pd.Timestamp(end), 'right')
+    start_row = max(start_row - bars_before, 0)
+    end_row = min(end_row + bars_after, manifest['rows'])
+    return _read_ohlc_rows(cache_path, manifest, start_row, end_row)
+
+def _ingest_state_path(raw_file_path):
+    return _ohlc_cache_path(raw_file_path) + '.ingest.json'
+
+def _boundary_checksum(f, offset, length=4096):
+    """
+    Returns the SHA-1 of the first bytes of a file and of the bytes just before offset,
+    used to detect a raw file that was rewritten rather than appended to.
+    """
+    digest = hashlib.sha1()
+    f.seek(0)
+    digest.update(f.read(min(offset, length)))
+    f.seek(max(offset - length, 0))
+    digest.update(f.read(min(offset, length)))
+    return digest.hexdigest()
+
+def _convert_raw_ohlc(raw_file_path, converted_file_path):
+    """Converts a whole raw Date,Time export into the DateTime CSV format and returns the ingest state for it."""
+    tf_ohlc_data = read_ohlc_csv(raw_file_path)
+    tf_ohlc_data.to_csv(converted_file_path)
+    with open(raw_file_path, 'rb') as f:
+        content = f.read()
+        offset = content.rfind(b'\n') + 1
+        checksum = _boundary_checksum(f, offset)
+    return {
+        'offset': offset,
+        'checksum': checksum,
+        'last_datetime': str(tf_ohlc_data.index[-1]) if len(tf_ohlc_data) else None
+    }
+
+def _append_to_ohlc_cache(cache_path, manifest, new_bars, file_path):
+    """
+    Appends bars that are later than everything in a partitioned OHLC cache.
+    Only the last partition is rewritten (when the new bars start in its month), plus any new months.
+    """
+    partitions = manifest['partitions']
+    if partitions and partitions[-1]['name'] == str(new_bars.index.values[0].astype('datetime64[M]')):
+        last = partitions.pop()
+        last_rows = _read_ohlc_rows(cache_path, {**manifest, 'partitions': [last]}, 0, last['rows'])
+        new_bars = pd.concat([last_rows, new_bars])
+    partitions.extend(_write_ohlc_partitions(cache_path, new_bars))
+    manifest.update({
+        'signature': _file_signature(file_path),
+        # The content hash is only consulted when size or mtime change, so it is recomputed on demand
+        'sha1': None,
+        'rows': sum(partition['rows'] for partition in partitions),
+        'partitions': partitions
+    })
+    _write_cache_manifest(cache_path, manifest)
+
+def ingest_appended_bars(raw_file_path, converted_file_path, full=False):
+    """
+    Brings a converted OHLC CSV and its columnar cache up to date with a raw Date,Time export that has grown.
+    The byte offset and last bar processed are remembered between runs, so only the new tail of the raw file is parsed.
+    The new bars get the same DateTime combination as the full conversion and are appended to the converted CSV;
+    if the converted file's cache is current they are also shifted to DISPLAY_TIMEZONE and appended to the cache,
+    so it does not have to be rebuilt. A raw file that shrank or was rewritten, or a converted file that changed
+    since the last run, is converted again from scratch.
+    Args:
+        raw_file_path (str): Path to the raw export, e.g. 'GUM1.csv'.
+        converted_file_path (str): Path to the converted file, e.g. 'GUM1_OHLC_dropnaCSV.csv'.
+        full (bool): Whether to convert the whole raw file even if only new bars were appended to it.
+    Returns:
+        int: Number of bars appended, or -1 if the whole file was converted again.
+    """
+    state_path = _ingest_state_path(raw_file_path)
+    try:
+        with open(state_path) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = None
+
+    with open(raw_file_path, 'rb') as f:
+        size = f.seek(0, os.SEEK_END)
+        valid = (
+            not full and state is not None and os.path.exists(converted_file_path)
+            and state.get('converted') == _file_signature(converted_file_path)
+            and state['offset'] <= size and _boundary_checksum(f, state['offset']) == state['checksum']
+        )
+        if valid:
+            f.seek(0)
+            header = f.readline()
+            f.seek(state['offset'])
+            tail = f.read()
+            tail = tail[:tail.rfind(b'\n') + 1]
+
+    if not valid:
+        os.makedirs(os.path.dirname(state_path), exist_ok=True)
+        state = _convert_raw_ohlc(raw_file_path, converted_file_path)
+        state['converted'] = _file_signature(converted_file_path)
+        _replace_file(state_path, lambda f: json.dump(state, f, indent=2), 'w')
+        return -1
+    if not tail:
+        return 0
+
+    new_rows = pd.read_csv(io.BytesIO(header + tail), dtype=RAW_OHLC_CSV_DTYPES)
+    datetimes = _combine_date_time(new_rows['Date'], _time_strings_to_seconds(new_rows['Time']))
+    new_bars = pd.DataFrame({column: new_rows[column].values for column in OHLC_COLUMNS}, index=pd.DatetimeIndex(datetimes, name='DateTime'))
+    if state['last_datetime'] is not None:
+        new_bars = new_bars[new_bars.index > pd.Timestamp(state['last_datetime'])]
+
+    if len(new_bars):
+        # Match the converted file's datetime format: daily files are written without a time of day
+        with open(converted_file_path) as f:
+            f.readline()
+            date_only = len(f.readline().split(',')[0]) == len('YYYY-MM-DD')
+        cache_path = _ohlc_cache_path(converted_file_path)
+        with _cache_lock(cache_path):
+            manifest = _read_cache_manifest(cache_path)
+            cache_current = manifest is not None and manifest.get('version') == _OHLC_CACHE_VERSION and manifest['signature'] == _file_signature(converted_file_path)
+
+            new_bars.to_csv(converted_file_path, mode='a', header=False, date_format='%Y-%m-%d' if date_only else '%Y-%m-%d %H:%M:%S')
+            if cache_current:
+                display_bars = new_bars.set_axis(convert_timezone(new_bars.index, OHLC_SOURCE_TIMEZONE, DISPLAY_TIMEZONE).rename('DateTime'))
+                _append_to_ohlc_cache(cache_path, manifest, display_bars, converted_file_path)
+        state['last_datetime'] = str(new_bars.index[-1])
+
+    with open(raw_file_path, 'rb') as f:
+        state['offset'] += len(tail)
+        state['checksum'] = _boundary_checksum(f, state['offset'])
+    state['converted'] = _file_signature(converted_file_path)
+    _replace_file(state_path, lambda f: json.dump(state, f, indent=2), 'w')
+    return len(new_bars)
+
+def load_trade_data(file_path, compact=False, symbol=DEFAULT_SYMBOL, source_tz=TRADE_SOURCE_TIMEZONE, target_tz=DISPLAY_TIMEZONE):
     """
     Loads trade data from a CSV file, parses date columns, and adjusts trade times.
     Args:
         file_path (str): Path to the trade data CSV file.
+        compact (bool): Whether to store the price columns as int32 pipettes instead of float64.
+        symbol (str): Symbol the prices are quoted for, used to scale compact prices.
+        source_tz (str): Time zone the trade times are recorded in. Defaults to the broker's server time zone.
+        target_tz (str): Time zone to express the trade times in. Defaults to DISPLAY_TIMEZONE.
     Returns:
         pd.DataFrame: DataFrame containing the trade data with adjusted times.
     """
     trade_data = pd.read_csv(file_path)
-    trade_data['Open Time'] = pd.to_datetime(trade_data['Open Time'], format='%Y-%m-%d %H:%M')
-    trade_data['Close Time'] = pd.to_datetime(trade_data['Close Time'], format='%Y-%m-%d %H:%M')
-    
-    # Adjust the trade times
-    trade_data = adjust_trade_times(trade_data, hours_offset=-2)
-    
+    return _normalize_trade_data(trade_data, '%Y-%m-%d %H:%M', compact, symbol, source_tz, target_tz)
+
+def _normalize_trade_data(trade_data, time_format, compact=False, symbol=DEFAULT_SYMBOL, source_tz=TRADE_SOURCE_TIMEZONE, target_tz=DISPLAY_TIMEZONE):
+    """
+    Parses the Open Time and Close Time columns and converts them between time zones one column and one chunk of
+    TRADE_TIME_CHUNK_ROWS at a time, writing each chunk straight into the column's datetime64 array. Peak memory is
+    that array plus the temporaries of a single chunk, rather than those of pd.to_datetime over the whole column.
+    Open DateTime and Close DateTime are added as aliases of the same columns, which pandas copy-on-write
+    (pandas 3, as pinned in requirements.txt) keeps as shared memory instead of copies.
+    """
+    for column in ['Open Time', 'Close Time']:
+        times = np.empty(len(trade_data), dtype='datetime64[us]')
+        for start in range(0, len(trade_data), TRADE_TIME_CHUNK_ROWS):
+            chunk = slice(start, start + TRADE_TIME_CHUNK_ROWS)
+            parsed = pd.to_datetime(trade_data[column].iloc[chunk], format=time_format)
+            times[chunk] = convert_timezone(parsed, source_tz, target_tz).values
+        trade_data[column] = pd.Series(times, index=trade_data.index, copy=False)
     trade_data['Open DateTime'] = trade_data['Open Time']
     trade_data['Close DateTime'] = trade_data['Close Time']
+
+    if compact:
+        trade_data = compact_prices(trade_data, TRADE_PRICE_COLUMNS, symbol)
     return trade_data
 
+def convert_trade_export(export_file_path, trade_file_path):
+    """
+    Converts a broker trade export such as Combined_GU_trades.csv into the trade CSV format read by load_trade_data.
+    Trades are sorted by opening time and numbered from 1, times are written as '%Y-%m-%d %H:%M' and the
+    Size/Price columns are renamed. Times are left in the broker's time zone; load_trade_data converts them.
+    Args:
+        export_file_path (str): Path to the export, with 'dd.mm.yyyy HH:MM' times and two 'Price' columns.
+        trade_file_path (str): Path to write the converted trades to, e.g. 'trades/trade_0.csv'.
+    Returns:
+        int: Number of trades written.
+    """
+    trades = pd.read_csv(export_file_path)
+    for column in ['Open Time', 'Close Time']:
+        trades[column] = pd.to_datetime(trades[column], format='%d.%m.%Y %H:%M')
+    trades = trades.sort_values(by='Open Time')
+    for column in ['Open Time', 'Close Time']:
+        trades[column] = trades[column].dt.strftime('%Y-%m-%d %H:%M')
+    trades.insert(0, 'Trade Number', range(1, 1 + len(trades)))
+    # read_csv names the second 'Price' column (the closing price) 'Price.1'
+    trades = trades.rename(columns={'Price': 'Opening Price', 'Price.1': 'Closing Price', 'Size': 'Volume'})
+    trades.to_csv(trade_file_path, index=False)
+    return len(trades)
+
+# Columns of a closed transaction row in an MT4 statement, named as in the trade CSV files.
+STATEMENT_COLUMNS = [
+    'Ticket', 'Open Time', 'Type', 'Volume', 'Item', 'Opening Price', 'S / L', 'T / P',
+    'Close Time', 'Closing Price', 'Commission', 'Taxes', 'Swap', 'Profit'
+]
+STATEMENT_NUMERIC_COLUMNS = ['Volume', 'Opening Price', 'S / L', 'T / P', 'Closing Price', 'Commission', 'Taxes', 'Swap', 'Profit']
+
+class _StatementParser(HTMLParser):
+    """Collects the rows of the 'Closed Transactions' table of an MT4 statement as lists of cell texts."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.rows = []
+        self.in_closed_transactions = False
+        self.cells = None
+        self.cell = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'tr':
+            self.cells = []
+        elif tag == 'td' and self.cells is not None:
+            self.cell = []
+
+    def handle_data(self, data):
+        if self.cell is not None:
+            self.cell.append(data)
+
+    def handle_endtag(self, tag):
+        if tag == 'td' and self.cell is not None:
+            self.cells.append(''.join(self.cell).strip())
+            self.cell = None
+        elif tag == 'tr' and self.cells is not None:
+            self.handle_row(self.cells)
+            self.cells = None
+
+    def handle_row(self, cells):
+        texts = [cell for cell in cells if cell]
+        # Section titles such as 'Closed Transactions:' or 'Open Trades:' are rows with a single cell ending in ':'
+        if len(texts) == 1 and texts[0].endswith(':'):
+            self.in_closed_transactions = texts[0] == 'Closed Transactions:'
+        elif self.in_closed_transactions and len(cells) == len(STATEMENT_COLUMNS) and cells[2] in ('buy', 'sell'):
+            self.rows.append(cells)
+
+def _statement_rows_to_frame(rows):
+    trades = pd.DataFrame(rows, columns=STATEMENT_COLUMNS)
+    trades['Ticket'] = trades['Ticket'].astype(np.int64)
+    for column in STATEMENT_NUMERIC_COLUMNS:
+        # Large amounts are printed with a space as thousands separator, e.g. '1 190.81'
+        trades[column] = pd.to_numeric(trades[column].str.replace(' ', '', regex=False))
+    return trades
+
+def load_statement_trades(file_path, compact=False, symbol=DEFAULT_SYMBOL, chunk_size=1 << 16, batch_rows=10000):
+    """
+    Loads the closed transactions of an MT4 HTML account statement into the same schema as load_trade_data.
+    The HTML is parsed incrementally in chunks and parsed rows are converted to typed frames in batches, so memory use
+    is bounded by the typed output rather than by the size of the statement. Trades are numbered by opening time.
+    Args:
+        file_path (str): Path to the statement, e.g. 'Notional_GU_Algo.html'.
+        compact (bool): Whether to store the price columns as int32 pipettes instead of float64.
+        symbol (str): Symbol the prices are quoted for, used to scale compact prices.
+        chunk_size (int): Number of characters fed to the HTML parser at a time.
+        batch_rows (int): Number of parsed rows converted to a typed frame at a time.
+    Returns:
+        pd.DataFrame: DataFrame containing the trade data with adjusted times.
+    """
+    parser = _StatementParser()
+    batches = []
+    with open(file_path, encoding='utf-8', errors='replace') as f:
+        for chunk in iter(lambda: f.read(chunk_size), ''):
+            parser.feed(chunk)
+            if len(parser.rows) >= batch_rows:
+                batches.append(_statement_rows_to_frame(parser.rows))
+                parser.rows = []
+    parser.close()
+    batches.append(_statement_rows_to_frame(parser.rows))
+
+    trade_data = pd.concat(batches, ignore_index=True)
+    trade_data['Open Time'] = trade_data['Open Time'].str.replace('.', '-', regex=False)
+    trade_data['Close Time'] = trade_data['Close Time'].str.replace('.', '-', regex=False)
+    trade_data = trade_data.sort_values('Open Time', kind='stable', ignore_index=True)
+    trade_data.insert(0, 'Trade Number', np.arange(1, len(trade_data) + 1))
+    return _normalize_trade_data(trade_data, 'ISO8601', compact, symbol)
+
+def load_trade_directory(directory, max_workers=None):
+    """
+    Loads every trade CSV file in a directory (e.g. one file per backtest run or account) into one frame.
+    Files are parsed in parallel worker processes, and each row is tagged with the name of its file in a Source column.
+    Trade numbers are kept as they are in each file, so selecting a number returns the matching trade of every source.
+    Args:
+        directory (str): Directory containing the trade CSV files.
+        max_workers (int, optional): Number of worker processes. Defaults to the number of CPUs.
+    Returns:
+        pd.DataFrame: DataFrame containing the trade data of all files, in file name order.
+    """
+    file_paths = sorted(glob.glob(os.path.join(directory, '*.csv')))
+    if not file_paths:
+        raise FileNotFoundError(f"No trade files found in {directory}")
+    if len(file_paths) == 1 or max_workers == 1:
+        frames = [load_trade_source(file_path) for file_path in file_paths]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            frames = list(executor.map(load_trade_source, file_paths))
+    return pd.concat(frames, ignore_index=True)
+
+def load_trade_source(file_path):
+    """Loads a trade CSV file with load_trade_data and tags each row with the file's name in a Source column."""
+    trade_data = load_trade_data(file_path)
+    trade_data['Source'] = os.path.splitext(os.path.basename(file_path))[0]
+    return trade_data
+
+# Process-wide registry of loaded frames, shared by every Streamlit session and rerun.
+_shared_data = {}
+_shared_data_locks = {}
+_shared_data_lock = threading.Lock()
+_shared_data_stats = {'hits': 0, 'misses': 0}
+
+def get_shared_data(key, file_paths, loader):
+    """
+    Returns the data stored under key, loading it once per process and sharing it between callers.
+    The entry is reloaded when the size or mtime of any of file_paths changes.
+    The returned frames are shared and must be treated as read-only; derive new frames instead of modifying them in place.
+    Args:
+        key (hashable): Registry key, e.g. ('ohlc', '5M').
+        file_paths (list): Files the data is loaded from.
+        loader (callable): Function without arguments that loads the data.
+    Returns:
+        The loaded data.
+    """
+    with _shared_data_lock:
+        key_lock = _shared_data_locks.setdefault(key, threading.Lock())
+    # Loads of different keys run concurrently; concurrent requests for the same key wait for a single load.
+    with key_lock:
+        signature = [_file_signature(file_path) for file_path in file_paths]
+        entry = _shared_data.get(key)
+        with _shared_data_lock:
+            if entry is not None and entry['signature'] == signature:
+                _shared_data_stats['hits'] += 1
+                return entry['data']
+            _shared_data_stats['misses'] += 1
+        data = loader()
+        _shared_data[key] = {'signature': signature, 'data': data}
+        return data
+
+def _is_shared_data_current(key, file_paths):
+    """Checks whether the registry holds an up-to-date entry for key, without counting a hit or miss."""
+    entry = _shared_data.get(key)
+    return entry is not None and entry['signature'] == [_file_signature(file_path) for file_path in file_paths]
+
+def shared_data_stats():
+    """Returns the registry's hit and miss counters and its number of entries."""
+    with _shared_data_lock:
+        return dict(_shared_data_stats, entries=len(_shared_data))
+
+def clear_shared_data():
+    """Drops every registry entry and resets the counters."""
+    with _shared_data_lock:
+        _shared_data.clear()
+        _shared_data_stats.update(hits=0, misses=0)
+
+def get_shared_ohlc_cache(timeframe):
+    """
+    Returns the cache directory and manifest of a timeframe's bars from the process-wide registry.
+    The registry holds only the manifest; bars are read from the memory-mapped partitions by row range when needed,
+    e.g. by slice_ohlc_around_trades, instead of keeping the whole history of every timeframe in memory.
+    """
+    file_path = OHLC_FILES.get(timeframe, OHLC_FILES[BASE_TIMEFRAME])
+    return get_shared_data(('ohlc', timeframe), [file_path], lambda: _ensure_timeframe_cache(timeframe))
+
+def _read_ohlc_columns(timeframe, columns):
+    """Reads some columns of a timeframe's whole history, e.g. only Low and High, leaving the others on disk."""
+    cache_path, manifest = get_shared_ohlc_cache(timeframe)
+    return _read_ohlc_rows(cache_path, manifest, 0, manifest['rows'], columns)
+
+# Background loads of timeframes the user has not selected yet; two workers keep the nearest ones first.
+_prefetch_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='ohlc-prefetch')
+_prefetch_futures = {}
+
+def prefetch_timeframes(selected_timeframe, timeframes):
+    """
+    Builds or checks the other timeframes' caches and loads their manifests into the shared registry on background
+    threads, nearest to the selected one first, so switching timeframes does not wait for a cache build.
+    Timeframes that are already loaded or loading are skipped.
+    Args:
+        selected_timeframe (str): The timeframe currently displayed.
+        timeframes (sequence): All selectable timeframes, in display order.
+    """
+    position = list(timeframes).index(selected_timeframe)
+    by_distance = sorted(timeframes, key=lambda timeframe: abs(list(timeframes).index(timeframe) - position))
+    for timeframe in by_distance:
+        file_path = OHLC_FILES.get(timeframe, OHLC_FILES[BASE_TIMEFRAME])
+        future = _prefetch_futures.get(timeframe)
+        if timeframe == selected_timeframe or (future is not None and not future.done()):
+            continue
+        if _is_shared_data_current(('ohlc', timeframe), [file_path]):
+            continue
+        _prefetch_futures[timeframe] = _prefetch_executor.submit(get_shared_ohlc_cache, timeframe)
+
+def _trade_source_files(path):
+    # A directory's own mtime changes when files are added, removed or renamed
+    if os.path.isdir(path):
+        return [path] + sorted(glob.glob(os.path.join(path, '*.csv')))
+    return [path]
+
+def get_shared_trades(path):
+    """
+    Returns the trade data of a file, or of every trade file in a directory, from the process-wide registry.
+    Either way each row carries the name of its file in a Source column.
+    """
+    loader = (lambda: load_trade_directory(path)) if os.path.isdir(path) else (lambda: load_trade_source(path))
+    return get_shared_data(('trades', os.path.abspath(path)), _trade_source_files(path), loader)
+
+def get_shared_trade_index(path):
+    """Returns the Trade Number index of a trade file's or directory's data from the process-wide registry."""
+    return get_shared_data(('trade_index', os.path.abspath(path)), _trade_source_files(path), lambda: build_trade_index(get_shared_trades(path)))
+
+def build_trade_index(trade_data):
+    """
+    Builds a sorted index of the Trade Number column for repeated selections.
+    Args:
+        trade_data (pd.DataFrame): DataFrame containing the trade data.
+    Returns:
+        dict: 'numbers', the sorted trade numbers, and 'positions', the row position of each of them in trade_data.
+    """
+    positions = np.argsort(trade_data['Trade Number'].values, kind='stable')
+    return {'numbers': trade_data['Trade Number'].values[positions], 'positions': positions}
+
+def select_trade_ranges(trade_data, trade_index, trade_ranges, columns=None, row_columns=None):
+    """
+    Selects the trades of a range set without expanding the ranges into individual numbers.
+    Each range is located with two binary searches on the index; stepped ranges are then filtered by their step.
+    Args:
+        trade_data (pd.DataFrame): DataFrame containing the trade data.
+        trade_index (dict): Index of trade_data built by build_trade_index.
+        trade_ranges (np.ndarray): Range set as returned by parse_trade_number_input.
+        columns (list, optional): Columns to return. Defaults to all columns.
+        row_columns (dict, optional): Arrays aligned with trade_data's rows, such as the bar positions of
+            get_shared_trade_bars or the excursions of get_shared_trade_excursions. Each is added to the selection
+            as a column.
+    Returns:
+        pd.DataFrame: The selected trades ordered by trade number, with a fresh index.
+    """
+    numbers = trade_index['numbers']
+    starts = np.searchsorted(numbers, trade_ranges[:, 0], side='left')
+    ends = np.searchsorted(numbers, trade_ranges[:, 1], side='right')
+    entries = []
+    for start, end, (first, _, step) in zip(starts, ends, trade_ranges):
+        run = np.arange(start, end)
+        if step != 1:
+            run = run[(numbers[start:end] - first) % step == 0]
+        entries.append(run)
+    entries = np.unique(np.concatenate(entries)) if entries else np.array([], dtype=np.int64)
+    return _take_trades(trade_data, trade_index['positions'][entries], columns, row_columns)
+
+def _take_trades(trade_data, rows, columns, row_columns):
+    if columns is not None:
+        trade_data = trade_data[columns]
+    selected = trade_data.take(rows).reset_index(drop=True)
+    for column, values in (row_columns or {}).items():
+        selected[column] = values[rows]
+    return selected
+
+def build_trade_bar_index(trade_data, tf_ohlc_data):
+    """
+    Locates every trade in a timeframe's bars with binary searches on the DatetimeIndex.
+    Args:
+        trade_data (pd.DataFrame): DataFrame containing the trade data.
+        tf_ohlc_data (pd.DataFrame): OHLC data indexed by DateTime, sorted ascending.
+    Returns:
+        dict: An int64 array of row positions in tf_ohlc_data per TRADE_BAR_COLUMNS entry, aligned with trade_data's rows.
+    """
+    index = tf_ohlc_data.index.values
+    open_times = trade_data['Open DateTime'].values
+    return {
+        'Open Bar': np.searchsorted(index, open_times, side='right') - 1,
+        'First Bar': np.searchsorted(index, open_times, side='left'),
+        'Close Bar': np.searchsorted(index, trade_data['Close DateTime'].values, side='right') - 1
+    }
+
+def _trade_bars_path(path, timeframe):
+    return f"{_ohlc_cache_path(path)}.bars@{timeframe}.npz"
+
+def _trade_bar_index_key(timeframe, source_files):
+    """
+    Returns the key the persisted bar positions of a timeframe are valid for: the source files' signatures, the cache
+    version and time zones that decide where bars and trades fall, and the extent of the timeframe's cached bars.
+    """
+    _, manifest = _ensure_timeframe_cache(timeframe)
+    return json.dumps({
+        'files': [_file_signature(file_path) for file_path in source_files],
+        'version': _OHLC_CACHE_VERSION,
+        'timezones': [OHLC_SOURCE_TIMEZONE, TRADE_SOURCE_TIMEZONE, DISPLAY_TIMEZONE],
+        'bars': {'rows': manifest['rows'], 'end': manifest['partitions'][-1]['end'] if manifest['partitions'] else None}
+    })
+
+def _load_trade_bar_index(path, timeframe, source_files):
+    """Reads a trade file's or directory's bar positions for a timeframe from disk, rebuilding them when their key changed."""
+    cache_file = _trade_bars_path(path, timeframe)
+    key = _trade_bar_index_key(timeframe, source_files)
+    try:
+        with np.load(cache_file) as cached:
+            if str(cached['key']) == key:
+                return {column: cached[column] for column in TRADE_BAR_COLUMNS}
+    except (OSError, KeyError, ValueError):
+        pass
+
+    trade_bars = build_trade_bar_index(get_shared_trades(path), _read_ohlc_columns(timeframe, []))
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    _replace_file(cache_file, lambda f: np.savez(f, key=np.array(key), **trade_bars))
+    return trade_bars
+
+def get_shared_trade_bars(path, timeframe):
+    """
+    Returns the bar positions of a trade file's or directory's trades in a timeframe, from the process-wide registry.
+    They are computed once per trade data and timeframe and persisted next to the OHLC cache, so later runs load them
+    from disk until a trade file or the timeframe's OHLC file changes.
+    """
+    source_files = _trade_source_files(path) + [OHLC_FILES.get(timeframe, OHLC_FILES[BASE_TIMEFRAME])]
+    return get_shared_data(('trade_bars', os.path.abspath(path), timeframe), source_files, lambda: _load_trade_bar_index(path, timeframe, source_files))
+
+def get_shared_excursion_index(timeframe, symbol=DEFAULT_SYMBOL):
+    """Returns the range-extreme indexes of an exported timeframe's bars from the process-wide registry."""
+    return get_shared_data(('excursion_index', timeframe, symbol), [OHLC_FILES[timeframe]], lambda: build_excursion_index(_read_ohlc_columns(timeframe, ['Low', 'High']), timeframe, symbol))
+
+def get_shared_trade_excursions(path, symbol=DEFAULT_SYMBOL):
+    """
+    Returns the excursions of a trade file's or directory's trades, each measured on the finest of EXCURSION_TIMEFRAMES
+    covering it, from the process-wide registry, as arrays aligned with the trades' rows. They do not depend on the
+    chart timeframe, so they are computed once per trade data and shared by every timeframe.
+    """
+    source_files = _trade_source_files(path) + [OHLC_FILES[timeframe] for timeframe in EXCURSION_TIMEFRAMES]
+    def load():
+        excursions = calculate_trade_excursions(get_shared_trades(path), symbol=symbol)
+        return {column: excursions[column].values for column in TRADE_EXCURSION_COLUMNS}
+    return get_shared_data(('trade_excursions', os.path.abspath(path), symbol), source_files, load)
+
+def _trade_bar_positions(trade_data, tf_ohlc_data):
+    """Returns the bar positions carried by trade_data, or locates the trades in tf_ohlc_data if it carries none."""
+    if all(column in trade_data for column in TRADE_BAR_COLUMNS):
+        return {column: trade_data[column].values for column in TRADE_BAR_COLUMNS}
+    return build_trade_bar_index(trade_data, tf_ohlc_data)
+
+def slice_ohlc_around_trades(ohlc_cache, trade_data, bars_before=0, bars_after=0):
+    """
+    Reads the bars from the first trade's open to the last trade's close, extended by whole bars on either side,
+    from a timeframe's cache by row range, touching only the partitions they lie in. The trades' bar positions are
+    rebased onto the rows read.
+    Args:
+        ohlc_cache (tuple): Cache directory and manifest of the timeframe, as returned by get_shared_ohlc_cache.
+        trade_data (pd.DataFrame): Trades carrying the TRADE_BAR_COLUMNS positions into the timeframe's bars.
+        bars_before (int): Number of extra bars to include before the first trade's open.
+        bars_after (int): Number of extra bars to include after the last trade's close.
+    Returns:
+        tuple: The selected bars, and trade_data with positions into them.
+    """
+    cache_path, manifest = ohlc_cache
+    start_row = max(int(trade_data['Open Bar'].min()) - bars_before, 0)
+    end_row = min(int(trade_data['Close Bar'].max()) + 1 + bars_after, manifest['rows'])
+    trade_data = trade_data.assign(**{column: trade_data[column] - start_row for column in TRADE_BAR_COLUMNS})
+    return _read_ohlc_rows(cache_path, manifest, start_row, end_row), trade_data
+
 def filter_initial_trades(df):
-    initial_trades = df.groupby('Close DateTime').first().reset_index()
+    # Trades of different sources closing together belong to separate runs
+    keys = ['Source', 'Close DateTime'] if 'Source' in df else 'Close DateTime'
+    initial_trades = df.groupby(keys).first().reset_index()
     return initial_trades
 
-def align_datetime_to_candle(dt, timeframe):
-    """Aligns datetime to the start of the candlestick based on the timeframe."""
-    if timeframe == 1:
-        dt = dt.replace(second=0, microsecond=0)
-    elif timeframe == 5:
-        intervals = dt.minute // 5
-        dt = dt.replace(minute=intervals * 5, second=0, microsecond=0)
-    elif timeframe == 15:
-        intervals = dt.minute // 15
-        dt = dt.replace(minute=intervals * 15, second=0, microsecond=0)
-    elif timeframe == 60:
-        dt = dt.replace(minute=0, second=0, microsecond=0)
-    elif timeframe == 240:
-        intervals = dt.hour // 4
-        dt = dt.replace(hour=intervals * 4, minute=0, second=0, microsecond=0)
-    elif timeframe == 1440:
-        dt = dt.replace(hour=0, minute=0, second=0, microsecond=0)
-
-    return dt
-
-def adjust_start_end_datetimes(start_dt, end_dt, selected_timeframe, tf_ohlc_data):
-    """Adjusts the start and end datetimes for the chart based on user input."""
-    start_dt = align_datetime_to_candle(start_dt, selected_timeframe)
-    end_dt = align_datetime_to_candle(end_dt, selected_timeframe)
-    return (max(start_dt, tf_ohlc_data.index[0]), min(end_dt, tf_ohlc_data.index[-1]))
+def _floor_minutes(minutes, timeframe_minutes):
+    """Floors int64 minutes since the epoch to bar boundaries counted from midnight, or from the epoch for bars longer than a day."""
+    anchor = minutes - minutes % 1440 if timeframe_minutes <= 1440 else 0
+    return anchor + (minutes - anchor) // timeframe_minutes * timeframe_minutes
+
+def align_datetimes_to_candles(datetimes, timeframe, session_tz=None, display_tz=DISPLAY_TIMEZONE):
+    """
+    Aligns a whole column of datetimes to the start of their candles in one vectorized pass.
+    Bars are counted from midnight, so any number of minutes that divides a day gives the usual boundaries.
+    Args:
+        datetimes (array-like): Naive datetimes in display_tz.
+        timeframe (int): Length of the bars in minutes.
+        session_tz (str, optional): Time zone whose midnight the bars are counted from. Defaults to
+            OHLC_SOURCE_TIMEZONE for bars of SESSION_ANCHOR_MINUTES or longer, matching the exported H4 and D1 bars,
+            and to display_tz for shorter bars.
+        display_tz (str): Time zone the datetimes are expressed in.
+    Returns:
+        pd.DatetimeIndex: The start of each datetime's candle, in display_tz.
+    """
+    if session_tz is None:
+        session_tz = OHLC_SOURCE_TIMEZONE if timeframe >= SESSION_ANCHOR_MINUTES else display_tz
+    datetimes = pd.DatetimeIndex(datetimes)
+    if session_tz != display_tz:
+        datetimes = convert_timezone(datetimes, display_tz, session_tz)
+    minutes = _floor_minutes(datetimes.values.astype('datetime64[m]').astype(np.int64), timeframe)
+    aligned = pd.DatetimeIndex(minutes.astype('datetime64[m]').astype(datetimes.dtype), name=datetimes.name)
+    if session_tz != display_tz:
+        aligned = convert_timezone(aligned, session_tz, display_tz)
+    return aligned
+
+def align_datetime_to_candle(dt, timeframe, session_tz=None, display_tz=DISPLAY_TIMEZONE):
+    """Aligns datetime to the start of the candlestick based on the timeframe, as align_datetimes_to_candles does."""
+    return align_datetimes_to_candles([dt], timeframe, session_tz, display_tz)[0]
 
 def create_candlestick_figure(filtered_data):
     """Creates the candlestick figure with the filtered data."""
@@ -125,27 +1138,24 @@ def add_lot_sizes(fig, start_dt, end_dt, volume, open_price):
     return fig
 
 def create_candlestick_chart(tf_ohlc_data, selected_trades, selected_timeframe, input_settings):
-    # Determine the number of minutes for the selected timeframe
-    timeframe_minutes = {
-        '1M': 1,
-        '5M': 5,
-        '15M': 15,
-        '1H': 60,
-        '4H': 240,
-        '1D': 1440
-    }
-
-    first_trade_start_datetime, last_trade_end_datetime = adjust_start_end_datetimes(selected_trades["Open DateTime"].iloc[0], selected_trades["Close DateTime"].iloc[-1], timeframe_minutes[selected_timeframe], tf_ohlc_data)
+    # Each trade is marked on the bars containing its open and close, clipped to the available bars
+    trade_bars = _trade_bar_positions(selected_trades, tf_ohlc_data)
+    open_bars = np.clip(trade_bars['Open Bar'], 0, len(tf_ohlc_data) - 1)
+    close_bars = np.clip(trade_bars['Close Bar'], 0, len(tf_ohlc_data) - 1)
 
     # Filter the data for the chart
-    chart_start_datetime = first_trade_start_datetime - pd.Timedelta(minutes=timeframe_minutes[selected_timeframe] * input_settings["Candles Before"])
-    chart_end_datetime = last_trade_end_datetime + pd.Timedelta(minutes=timeframe_minutes[selected_timeframe] * input_settings["Candles After"])
-    filtered_data = tf_ohlc_data.loc[chart_start_datetime:chart_end_datetime]
+    chart_start_row = max(open_bars.min() - input_settings["Candles Before"], 0)
+    chart_end_row = min(close_bars.max() + input_settings["Candles After"], len(tf_ohlc_data) - 1)
+    chart_start_datetime = tf_ohlc_data.index[chart_start_row]
+    chart_end_datetime = tf_ohlc_data.index[chart_end_row]
+    filtered_data = tf_ohlc_data.iloc[chart_start_row:chart_end_row + 1]
     # Create the candlestick figure and add markers and lines
     fig = create_candlestick_figure(filtered_data)
 
-    for index, trade in selected_trades.iterrows():
-        trade_start_datetime, trade_end_datetime = adjust_start_end_datetimes(trade["Open DateTime"], trade["Close DateTime"], timeframe_minutes[selected_timeframe], tf_ohlc_data)
+    trade_start_datetimes = tf_ohlc_data.index[open_bars]
+    trade_end_datetimes = tf_ohlc_data.index[close_bars]
+    for position, (index, trade) in enumerate(selected_trades.iterrows()):
+        trade_start_datetime, trade_end_datetime = trade_start_datetimes[position], trade_end_datetimes[position]
         fig = add_price_markers(fig, trade_start_datetime, trade_end_datetime, trade["Opening Price"], trade["Closing Price"], trade["Type"])
         if input_settings["Showing Position Lot Size"]:
             fig = add_lot_sizes(fig, trade_start_datetime, trade_end_datetime, trade["Volume"], trade["Opening Price"])
@@ -163,11 +1173,13 @@ def create_candlestick_chart(tf_ohlc_data, selected_trades, selected_timeframe,
         showlegend=False
     )
 
+    # Indicators are computed only over the charted bars and the look-back each of them declares
     if input_settings["Display RSI?"]:
-        fig = add_rsi(fig, tf_ohlc_data, chart_start_datetime, chart_end_datetime, timeframe_minutes[selected_timeframe], input_settings["RSI Length"])
+        rsi = get_indicator_window(tf_ohlc_data, selected_timeframe, 'RSI', chart_start_row, chart_end_row + 1, input_settings["RSI Length"])
+        fig = add_rsi(fig, rsi, chart_start_datetime, chart_end_datetime)
 
     if input_settings["Display Bollinger Bands?"]:
-        upper_band, middle_band, lower_band = calculate_bollinger_bands(tf_ohlc_data, input_settings["Bollinger Bands Period"], input_settings["Bollinger Bands Std. Dev"])
+        upper_band, middle_band, lower_band = get_indicator_window(tf_ohlc_data, selected_timeframe, 'Bollinger Bands', chart_start_row, chart_end_row + 1, input_settings["Bollinger Bands Period"], input_settings["Bollinger Bands Std. Dev"])
         fig = add_bollinger_bands(fig, upper_band, middle_band, lower_band, chart_start_datetime, chart_end_datetime)
     
     # Remove gaps from chart
@@ -175,22 +1187,49 @@ def create_candlestick_chart(tf_ohlc_data, selected_trades, selected_timeframe,
 
     return fig
 
+# Windows reduced per chunk by the rolling kernels, bounding their temporary memory.
+ROLLING_CHUNK_ROWS = 1 << 16
+
+def _rolling_reduce(values, period, reduce):
+    """
+    Applies reduce to every full window of period values and aligns the results with each window's last value.
+    Each window is reduced on its own rather than updated from the previous one, so a value does not depend on where
+    the series starts.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    result = np.full(len(values), np.nan)
+    if len(values) < period:
+        return result
+    windows = sliding_window_view(values, period)
+    for start in range(0, len(windows), ROLLING_CHUNK_ROWS):
+        chunk = windows[start:start + ROLLING_CHUNK_ROWS]
+        result[period - 1 + start:period - 1 + start + len(chunk)] = reduce(chunk)
+    return result
+
+def rolling_mean(values, period):
+    """Returns the mean of each full window of period values, NaN before the first one."""
+    return _rolling_reduce(values, period, lambda windows: windows.mean(axis=1))
+
+def rolling_std(values, period):
+    """Returns the sample standard deviation of each full window of period values, NaN before the first one."""
+    if period < 2:
+        return np.full(len(values), np.nan)
+    return _rolling_reduce(values, period, lambda windows: windows.std(axis=1, ddof=1))
+
 def calculate_rsi(data, period):
-    delta = data['Close'].diff()
-    gain = ((delta > 0) * delta).fillna(0)
-    loss = ((delta < 0) * -delta).fillna(0)
+    delta = np.diff(data['Close'].values, prepend=np.nan)
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
 
-    avg_gain = gain.rolling(window=period).mean()
-    avg_loss = loss.rolling(window=period).mean()
+    avg_gain = rolling_mean(gain, period)
+    avg_loss = rolling_mean(loss, period)
 
-    rs = avg_gain / avg_loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = avg_gain / avg_loss
+        rsi = 100 - (100 / (1 + rs))
+    return pd.Series(rsi, index=data.index)
 
-def add_rsi(fig, tf_ohlc_data, chart_start_datetime, chart_end_datetime, timeframe_minutes, period):
-    # Calculate RSI
-    start_rsi_datetime = chart_start_datetime - pd.Timedelta(minutes=timeframe_minutes * period)
-    rsi = calculate_rsi(tf_ohlc_data.loc[start_rsi_datetime:chart_end_datetime], period)
+def add_rsi(fig, rsi, chart_start_datetime, chart_end_datetime):
     rsi = rsi[chart_start_datetime:chart_end_datetime]
 
     # Create a subplot with 2 rows
@@ -228,13 +1267,105 @@ def add_rsi(fig, tf_ohlc_data, chart_start_datetime, chart_end_datetime, timefra
     return new_fig
 
 def calculate_bollinger_bands(data, period=20, num_of_std=2):
-    middle_band = data['Close'].rolling(window=period).mean()
-    std_dev = data['Close'].rolling(window=period).std()
+    closes = data['Close'].values
+    middle_band = pd.Series(rolling_mean(closes, period), index=data.index)
+    std_dev = pd.Series(rolling_std(closes, period), index=data.index)
     upper_band = middle_band + (std_dev * num_of_std)
     lower_band = middle_band - (std_dev * num_of_std)
     
     return upper_band, middle_band, lower_band
 
+# Indicators by name. Each function takes an OHLC frame and its parameters and returns a Series or a tuple of them;
+# each lookback takes the same parameters and returns how many bars before a value the function reads.
+INDICATORS = {
+    'RSI': {'function': calculate_rsi, 'lookback': lambda period: period},
+    'Bollinger Bands': {'function': calculate_bollinger_bands, 'lookback': lambda period, num_of_std=2: period - 1}
+}
+
+def indicator_lookback(indicator, *params):
+    """Returns the number of bars before a value that an indicator reads, for the given parameters."""
+    return INDICATORS[indicator]['lookback'](*params)
+
+# Memory cap of the indicator cache; the least recently used results are dropped beyond it.
+INDICATOR_CACHE_MAX_BYTES = 64 << 20
+
+_indicator_cache = OrderedDict()
+_indicator_cache_lock = threading.Lock()
+_indicator_cache_stats = {'hits': 0, 'misses': 0, 'bytes': 0}
+
+def _ohlc_fingerprint(tf_ohlc_data):
+    """Returns a digest of the bars' DateTime index and Close prices, which every indicator is computed from."""
+    digest = hashlib.sha1()
+    digest.update(np.ascontiguousarray(tf_ohlc_data.index.values).view(np.uint8))
+    digest.update(np.ascontiguousarray(tf_ohlc_data['Close'].values).view(np.uint8))
+    return digest.hexdigest()
+
+def get_indicator(tf_ohlc_data, timeframe, indicator, *params):
+    """
+    Returns an indicator computed over tf_ohlc_data, from a process-wide LRU cache keyed by the data's fingerprint,
+    the timeframe, the indicator and its parameters. Recomputing it for the same bars, e.g. after toggling an
+    indicator off and on again, is then a cache hit. Cached results are shared and must be treated as read-only.
+    Args:
+        tf_ohlc_data (pd.DataFrame): OHLC data indexed by DateTime.
+        timeframe (hashable): Timeframe of the data, e.g. '5M'.
+        indicator (str): Name of the indicator in INDICATORS, e.g. 'RSI'.
+        *params: Parameters passed to the indicator function after the data, e.g. the period.
+    Returns:
+        The indicator function's result: a Series, or a tuple of Series.
+    """
+    key = (_ohlc_fingerprint(tf_ohlc_data), timeframe, indicator, params)
+    with _indicator_cache_lock:
+        if key in _indicator_cache:
+            _indicator_cache.move_to_end(key)
+            _indicator_cache_stats['hits'] += 1
+            return _indicator_cache[key]['result']
+        _indicator_cache_stats['misses'] += 1
+
+    result = INDICATORS[indicator]['function'](tf_ohlc_data, *params)
+    series = result if isinstance(result, tuple) else (result,)
+    size = sum(values.memory_usage(index=True) for values in series)
+    with _indicator_cache_lock:
+        if key not in _indicator_cache:
+            _indicator_cache[key] = {'result': result, 'bytes': size}
+            _indicator_cache_stats['bytes'] += size
+        # A result larger than the cap on its own is returned without being kept
+        while _indicator_cache_stats['bytes'] > INDICATOR_CACHE_MAX_BYTES:
+            _, evicted = _indicator_cache.popitem(last=False)
+            _indicator_cache_stats['bytes'] -= evicted['bytes']
+    return result
+
+def get_indicator_window(tf_ohlc_data, timeframe, indicator, start_row, end_row, *params):
+    """
+    Returns an indicator for the bars tf_ohlc_data.iloc[start_row:end_row], computed only over those bars and the
+    look-back the indicator declares. The rolling kernels reduce every window on its own, so the values are identical
+    to a computation over the whole history, while the cost scales with the window.
+    Args:
+        tf_ohlc_data (pd.DataFrame): OHLC data indexed by DateTime.
+        timeframe (hashable): Timeframe of the data, e.g. '5M'.
+        indicator (str): Name of the indicator in INDICATORS, e.g. 'RSI'.
+        start_row (int): Position of the first bar to return.
+        end_row (int): Position after the last bar to return.
+        *params: Parameters of the indicator, e.g. the period.
+    Returns:
+        The indicator function's result for the requested bars: a Series, or a tuple of Series.
+    """
+    window_start = max(start_row - indicator_lookback(indicator, *params), 0)
+    result = get_indicator(tf_ohlc_data.iloc[window_start:end_row], timeframe, indicator, *params)
+    if isinstance(result, tuple):
+        return tuple(series.iloc[start_row - window_start:] for series in result)
+    return result.iloc[start_row - window_start:]
+
+def indicator_cache_stats():
+    """Returns the indicator cache's hit and miss counters, its number of entries and their size in bytes."""
+    with _indicator_cache_lock:
+        return dict(_indicator_cache_stats, entries=len(_indicator_cache))
+
+def clear_indicator_cache():
+    """Drops every cached indicator and resets the counters."""
+    with _indicator_cache_lock:
+        _indicator_cache.clear()
+        _indicator_cache_stats.update(hits=0, misses=0, bytes=0)
+
 def add_bollinger_bands(fig, upper_band, middle_band, lower_band, start_datetime, end_datetime):
     upper_band = upper_band[start_datetime:end_datetime]
     middle_band = middle_band[start_datetime:end_datetime]
@@ -246,84 +1377,98 @@ def add_bollinger_bands(fig, upper_band, middle_band, lower_band, start_datetime
     
     return fig
 
-def adjust_trade_times(df, hours_offset=-2):
-    """
-    Adjusts the Open Time and Close Time columns by the specified number of hours.
-    Args:
-        df (pd.DataFrame): DataFrame containing the trade data.
-        hours_offset (int): Number of hours to adjust the times by. Default is -2.
-    Returns:
-        pd.DataFrame: DataFrame with adjusted Open Time and Close Time.
-    """
-    df['Open Time'] = df['Open Time'] + pd.Timedelta(hours=hours_offset)
-    df['Close Time'] = df['Close Time'] + pd.Timedelta(hours=hours_offset)
-    return df
-
 def group_trades_into_signals(trade_data):
     """
     Groups trades into signals based on their type and closing time.
+    Consecutive trades of the same type form a signal. Trades of different sources (the Source column of
+    load_trade_directory) are separate runs, so they are ordered by source first and never share a signal.
+    Each signal's rows are one run of the sorted trades, so every per-signal value is a segment reduction over the
+    runs, broadcast back to the rows in the same pass.
     Args:
         trade_data (pd.DataFrame): DataFrame containing the trade data.
     Returns:
-        pd.DataFrame: DataFrame with an additional column indicating the signal group.
+        pd.DataFrame: DataFrame with additional columns holding each trade's signal group and that signal's
+            close time, open time, first opening price, trade count and total volume.
     """
-    trade_data = trade_data.sort_values(by='Open DateTime')
-    trade_data['Signal Group'] = (trade_data['Type'] != trade_data['Type'].shift()).cumsum()
-    
-    for _, group in trade_data.groupby('Signal Group'):
-        close_time = group['Close DateTime'].max()
-        trade_data.loc[group.index, 'Signal Close Time'] = close_time
+    if 'Source' in trade_data:
+        trade_data = trade_data.sort_values(by=['Source', 'Open DateTime'], kind='stable')
+    else:
+        trade_data = trade_data.sort_values(by='Open DateTime')
+    types = trade_data['Type'].values
+    new_signal = np.ones(len(trade_data), dtype=bool)
+    new_signal[1:] = types[1:] != types[:-1]
+    if 'Source' in trade_data:
+        sources = trade_data['Source'].values
+        new_signal[1:] |= sources[1:] != sources[:-1]
+    starts = np.flatnonzero(new_signal)
+    counts = np.diff(np.append(starts, len(trade_data)))
 
+    trade_data['Signal Group'] = np.cumsum(new_signal)
+    trade_data['Signal Close Time'] = np.repeat(np.maximum.reduceat(trade_data['Close DateTime'].values, starts), counts)
+    trade_data['Signal Open Time'] = np.repeat(trade_data['Open DateTime'].values[starts], counts)
+    trade_data['Signal First Price'] = np.repeat(trade_data['Opening Price'].values[starts], counts)
+    trade_data['Signal Trade Count'] = np.repeat(counts, counts)
+    trade_data['Signal Volume'] = np.repeat(np.add.reduceat(trade_data['Volume'].values, starts), counts)
     return trade_data
 
-def calculate_mean_pips_away(trade_data):
+def calculate_signal_statistics(trade_data, tf_ohlc_data=None, basket_curves=None, symbol=DEFAULT_SYMBOL):
     """
-    Calculates the mean pips away from the open price of the first trade in each signal and counts the number of trades.
+    Calculates every per-signal aggregate of the dashboard in one pass over the trades. This is the one entry point for
+    per-signal statistics; callers needing a single aggregate select its column.
+    The trades are ordered by signal once, so each signal is a contiguous run and every aggregate is a segment reduction
+    over the run starts. Pips away are measured from the opening price of the signal's first trade; prices are compared
+    as integer pipettes, so the result is exact for both float and compact trade data.
     Args:
-        trade_data (pd.DataFrame): DataFrame containing the trade data.
+        trade_data (pd.DataFrame): DataFrame containing the trade data, grouped by group_trades_into_signals.
+        tf_ohlc_data (pd.DataFrame, optional): OHLC data covering the trades. If given, the table also holds each
+            signal's Max Pip Drawdown as calculated by calculate_max_pip_drawdown. Trades carrying the
+            TRADE_EXCURSION_COLUMNS take it from their excursions instead, measured on the finest bars covering each
+            trade, so it does not depend on the timeframe,
+            and the table then also holds each signal basket's excursions as 'Basket ' + TRADE_EXCURSION_COLUMNS.
+        basket_curves (pd.DataFrame, optional): The trades' curves from calculate_basket_curves. If given, the table
+            also holds each basket's Max Floating Loss, the lowest floating P&L it reached.
+        symbol (str): Symbol the prices are quoted for.
     Returns:
-        pd.DataFrame: DataFrame with the mean pips away and trade count for each signal.
+        pd.DataFrame: One row per signal with its Signal Group, Signal Open Time, Type, Trade Count, Volume,
+            Initial Volume, Mean Pips Away and Median Pips Away, ordered by Signal Group.
     """
-    signals = trade_data.groupby('Signal Group')
-    mean_pips_away_list = []
+    order = np.argsort(trade_data['Signal Group'].values, kind='stable')
+    groups = trade_data['Signal Group'].values[order]
+    new_signal = np.ones(len(groups), dtype=bool)
+    new_signal[1:] = groups[1:] != groups[:-1]
+    starts = np.flatnonzero(new_signal)
+    counts = np.diff(np.append(starts, len(groups)))
 
-    for signal_group, trades in signals:
-        first_open_price = trades.iloc[0]['Opening Price']
-        trades['Pips Away'] = (trades['Opening Price'] - first_open_price) * 10000  # Assuming pip calculation for GBPUSD
-        mean_pips_away = trades['Pips Away'].mean()
-        trade_count = trades.shape[0]
-        mean_pips_away_list.append({
-            'Signal Group': signal_group, 
-            'Mean Pips Away': mean_pips_away, 
-            'Trade Count': trade_count
-        })
+    volumes = trade_data['Volume'].values[order]
+    pipettes = to_pipettes(trade_data['Opening Price'].values[order], symbol)
+    pips_away = (pipettes - np.repeat(pipettes[starts], counts)) / PIPETTES_PER_PIP
 
-    return pd.DataFrame(mean_pips_away_list)
+    # Sorting by pips within each signal puts every signal's median at the middle of its run
+    sorted_pips = pips_away[np.lexsort((pips_away, np.repeat(np.arange(len(starts)), counts)))]
+    median_pips_away = (sorted_pips[starts + (counts - 1) // 2] + sorted_pips[starts + counts // 2]) / 2
 
-
-def calculate_median_pips_away(trade_data):
-    """
-    Calculates the median pips away from the open price of the first trade in each signal and counts the number of trades.
-    Args:
-        trade_data (pd.DataFrame): DataFrame containing the trade data.
-    Returns:
-        pd.DataFrame: DataFrame with the median pips away and trade count for each signal.
-    """
-    signals = trade_data.groupby('Signal Group')
-    median_pips_away_list = []
-
-    for signal_group, trades in signals:
-        first_open_price = trades.iloc[0]['Opening Price']
-        trades['Pips Away'] = (trades['Opening Price'] - first_open_price) * 10000  # Assuming pip calculation for GBPUSD
-        median_pips_away = trades['Pips Away'].median()
-        trade_count = trades.shape[0]
-        median_pips_away_list.append({
-            'Signal Group': signal_group, 
-            'Median Pips Away': median_pips_away, 
-            'Trade Count': trade_count
-        })
-
-    return pd.DataFrame(median_pips_away_list)
+    signal_statistics = pd.DataFrame({
+        'Signal Group': groups[starts],
+        'Signal Open Time': trade_data['Open DateTime'].values[order][starts],
+        'Type': trade_data['Type'].values[order][starts],
+        'Trade Count': counts,
+        'Volume': np.add.reduceat(volumes, starts),
+        'Initial Volume': volumes[starts],
+        'Mean Pips Away': np.add.reduceat(pips_away, starts) / counts,
+        'Median Pips Away': median_pips_away
+    })
+    if all(column in trade_data for column in TRADE_EXCURSION_COLUMNS):
+        # The initial trade's adverse excursion on the finest bars covering it
+        signal_statistics['Max Pip Drawdown'] = trade_data['MAE Pips'].values[order][starts]
+        basket_excursions = calculate_signal_excursions(trade_data, symbol=symbol)
+        for column in TRADE_EXCURSION_COLUMNS:
+            signal_statistics['Basket ' + column] = basket_excursions[column].values
+    elif tf_ohlc_data is not None:
+        signal_statistics['Max Pip Drawdown'] = calculate_max_pip_drawdown(trade_data, tf_ohlc_data, symbol)['Max Pip Drawdown'].values
+    if basket_curves is not None:
+        max_floating_losses = basket_curves.groupby('Signal Group')['Floating P&L'].min()
+        signal_statistics['Max Floating Loss'] = max_floating_losses.reindex(signal_statistics['Signal Group']).values
+    return signal_statistics
 
 def calculate_daily_profits(trade_data):
     """
@@ -338,73 +1483,350 @@ def calculate_daily_profits(trade_data):
     daily_profits['Close Date'] = pd.to_datetime(daily_profits['Close Date'])
     return daily_profits
 
-
-def calculate_cumulative_volume(trade_data):
+def build_range_extreme_index(values, reduce):
     """
-    Calculates the cumulative volume for each signal.
+    Builds an index answering the minimum or maximum of any range of values in constant time.
+    The values are split into blocks of RANGE_INDEX_BLOCK_SIZE. The index keeps the running extreme from each block's
+    start and to each block's end, plus a sparse table over whole-block extremes, so it takes about twice the memory
+    of the values instead of the n log n of a plain sparse table.
     Args:
-        trade_data (pd.DataFrame): DataFrame containing the trade data.
+        values (np.ndarray): Values to index, e.g. the Low prices of a timeframe as pipettes.
+        reduce (np.ufunc): np.minimum or np.maximum.
     Returns:
-        pd.DataFrame: DataFrame with the cumulative volume for each signal.
+        dict: The index, to be queried with query_range_extremes.
     """
-    cumulative_volume_df = trade_data.groupby('Signal Group')['Volume'].sum().reset_index()
-    return cumulative_volume_df
+    values = np.asarray(values)
+    block_size = RANGE_INDEX_BLOCK_SIZE
+    # Padding with the last value leaves every extreme unchanged
+    padding = -len(values) % block_size
+    blocks = np.concatenate((values, np.repeat(values[-1:], padding))).reshape(-1, block_size)
 
+    levels = [reduce.reduce(blocks, axis=1)]
+    width = 1
+    while 2 * width <= len(levels[0]):
+        levels.append(reduce(levels[-1][:-width], levels[-1][width:]))
+        width *= 2
+    return {
+        'values': values,
+        'reduce': reduce,
+        'prefix': reduce.accumulate(blocks, axis=1).ravel()[:len(values)],
+        'suffix': reduce.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()[:len(values)],
+        'levels': levels
+    }
 
-def calculate_cumulative_trades_per_signal(trade_data):
+def query_range_extremes(range_index, starts, ends):
     """
-    Calculates the cumulative number of trades for each signal.
+    Returns the extreme of values[start:end] for many ranges at once.
+    A range within one block is reduced directly over at most RANGE_INDEX_BLOCK_SIZE values. A longer range combines
+    the running extremes of its first and last blocks with two overlapping sparse table entries covering the whole
+    blocks in between.
     Args:
-        trade_data (pd.DataFrame): DataFrame containing the trade data.
+        range_index (dict): Index built by build_range_extreme_index.
+        starts (array-like): First position of each range.
+        ends (array-like): Position after the last of each range. Every range must be non-empty.
     Returns:
-        pd.DataFrame: DataFrame with the cumulative number of trades for each signal.
+        np.ndarray: The extreme of each range.
     """
-    cumulative_trades_df = trade_data.groupby('Signal Group').size().reset_index(name='Trade Count')
-    return cumulative_trades_df
+    values, reduce, block_size = range_index['values'], range_index['reduce'], RANGE_INDEX_BLOCK_SIZE
+    starts = np.asarray(starts, dtype=np.int64)
+    lasts = np.asarray(ends, dtype=np.int64) - 1
+    start_blocks, last_blocks = starts // block_size, lasts // block_size
+    extremes = np.empty(len(starts), dtype=values.dtype)
 
+    within = start_blocks == last_blocks
+    # Positions past the end of a range repeat its last value
+    offsets = np.minimum(np.arange(block_size), (lasts[within] - starts[within])[:, None])
+    extremes[within] = reduce.reduce(values[starts[within, None] + offsets], axis=1)
 
+    spanning = ~within
+    spanning_extremes = reduce(range_index['suffix'][starts[spanning]], range_index['prefix'][lasts[spanning]])
+    inner_starts, inner_ends = start_blocks[spanning] + 1, last_blocks[spanning]
+    inner_lengths = inner_ends - inner_starts
+    # frexp gives floor(log2(length)) + 1 exactly for positive integers
+    levels = np.frexp(np.maximum(inner_lengths, 1))[1] - 1
+    for level in np.unique(levels[inner_lengths > 0]):
+        rows = (inner_lengths > 0) & (levels == level)
+        table = range_index['levels'][level]
+        spanning_extremes[rows] = reduce(
+            spanning_extremes[rows],
+            reduce(table[inner_starts[rows]], table[inner_ends[rows] - (1 << level)])
+        )
+    extremes[spanning] = spanning_extremes
+    return extremes
 
-def calculate_initial_trade_volume(trade_data):
+def calculate_max_pip_drawdown(trade_data, tf_ohlc_data, symbol=DEFAULT_SYMBOL):
     """
-    Calculates the volume of the initial trade in each signal.
+    Calculates the maximum pip drawdown for the initial trade in each signal.
+    Each trade's bars are located by their positions and reduced with a range-extreme index over the Low or High
+    prices, so every trade costs a constant-time query regardless of how long it was open.
+    Prices are compared as integer pipettes, so the result is exact for both float and compact data.
     Args:
         trade_data (pd.DataFrame): DataFrame containing the trade data.
+        tf_ohlc_data (pd.DataFrame): DataFrame containing the OHLC data.
+        symbol (str): Symbol the prices are quoted for.
     Returns:
-        pd.DataFrame: DataFrame with the volume of the initial trade for each signal.
+        pd.DataFrame: DataFrame with the maximum pip drawdown for each signal.
     """
     initial_trades = trade_data.groupby('Signal Group').first().reset_index()
-    initial_trade_volume_df = initial_trades[['Signal Group', 'Volume']]
-    return initial_trade_volume_df
+    trade_bars = _trade_bar_positions(initial_trades, tf_ohlc_data)
+    open_prices = to_pipettes(initial_trades['Opening Price'].values, symbol)
+
+    # The bars of each trade's period: from the first bar starting at or after its open to the bar containing its close
+    starts = np.maximum(trade_bars['First Bar'], 0)
+    ends = trade_bars['Close Bar'] + 1
+    has_bars = ends > starts
+    buys = has_bars & (initial_trades['Type'].values == 'buy')
+    sells = has_bars & (initial_trades['Type'].values != 'buy')
+
+    max_drawdowns = np.full(len(initial_trades), np.nan)
+    if buys.any():
+        lows = build_range_extreme_index(to_pipettes(tf_ohlc_data['Low'], symbol), np.minimum)
+        max_drawdowns[buys] = (query_range_extremes(lows, starts[buys], ends[buys]) - open_prices[buys]) / PIPETTES_PER_PIP
+    if sells.any():
+        highs = build_range_extreme_index(to_pipettes(tf_ohlc_data['High'], symbol), np.maximum)
+        max_drawdowns[sells] = (open_prices[sells] - query_range_extremes(highs, starts[sells], ends[sells])) / PIPETTES_PER_PIP
+
+    return pd.DataFrame({
+        'Signal Group': initial_trades['Signal Group'],
+        'Max Pip Drawdown': max_drawdowns
+    })
+
+# Lower 32 bits of the packed price and position keys of an excursion index
+_POSITION_MASK = (1 << 32) - 1
 
-def calculate_max_pip_drawdown(trade_data, tf_ohlc_data):
+def build_excursion_index(tf_ohlc_data, timeframe, symbol=DEFAULT_SYMBOL):
     """
-    Calculates the maximum pip drawdown for the initial trade in each signal.
+    Builds range-extreme indexes over the Low and High prices that also locate the extremes.
+    Each price is packed with its bar position into one int64 key, pipettes in the upper 32 bits, so the minimum key of
+    a range holds its lowest Low at the earliest bar reaching it; High keys store the position inverted for the same.
     Args:
-        trade_data (pd.DataFrame): DataFrame containing the trade data.
-        tf_ohlc_data (pd.DataFrame): DataFrame containing the OHLC data.
+        tf_ohlc_data (pd.DataFrame): OHLC data indexed by DateTime, sorted ascending.
+        timeframe (str): Timeframe of the bars, e.g. '1M', used to find the end of the last bar.
+        symbol (str): Symbol the prices are quoted for.
     Returns:
-        pd.DataFrame: DataFrame with the maximum pip drawdown for each signal.
+        dict: The bars' DatetimeIndex, the span of time they cover and the 'lows' and 'highs' indexes.
     """
-    initial_trades = trade_data.groupby('Signal Group').first().reset_index()
-    
-    drawdowns = []
-    
-    for _, trade in initial_trades.iterrows():
-        trade_open_time = trade['Open DateTime']
-        trade_close_time = trade['Close DateTime']
-        open_price = trade['Opening Price']
-        
-        # Filter OHLC data for the period of the trade
-        trade_ohlc_data = tf_ohlc_data[(tf_ohlc_data.index >= trade_open_time) & (tf_ohlc_data.index <= trade_close_time)]
-        
-        if trade['Type'] == 'buy':
-            max_drawdown = (trade_ohlc_data['Low'].min() - open_price) * 10000
+    positions = np.arange(len(tf_ohlc_data), dtype=np.int64)
+    low_keys = (to_pipettes(tf_ohlc_data['Low'], symbol) << 32) | positions
+    high_keys = (to_pipettes(tf_ohlc_data['High'], symbol) << 32) | (_POSITION_MASK - positions)
+    return {
+        'index': tf_ohlc_data.index,
+        'start': tf_ohlc_data.index.values[0],
+        'end': tf_ohlc_data.index.values[-1] + np.timedelta64(timeframe_to_minutes(timeframe), 'm'),
+        'lows': build_range_extreme_index(low_keys, np.minimum),
+        'highs': build_range_extreme_index(high_keys, np.maximum)
+    }
+
+def calculate_excursions(open_times, close_times, types, open_prices, excursion_index, symbol=DEFAULT_SYMBOL):
+    """
+    Calculates the maximum adverse and favourable excursion of many positions at once.
+    Each position covers the bars from the first one starting at or after its open to the one containing its close,
+    the same window as calculate_max_pip_drawdown, and costs two constant-time range queries.
+    Args:
+        open_times (array-like): Opening time of each position.
+        close_times (array-like): Closing time of each position.
+        types (array-like): 'buy' or 'sell' for each position.
+        open_prices (array-like): Opening price of each position, as a float price or as pipettes.
+        excursion_index (dict): Index built by build_excursion_index.
+        symbol (str): Symbol the prices are quoted for.
+    Returns:
+        pd.DataFrame: The TRADE_EXCURSION_COLUMNS for each position; NaN/NaT for positions without bars or not lying
+            wholly within the span of the indexed bars.
+    """
+    index = excursion_index['index']
+    open_times = np.asarray(open_times, dtype='datetime64[us]')
+    close_times = np.asarray(close_times, dtype='datetime64[us]')
+    starts = np.searchsorted(index.values, open_times, side='left')
+    ends = np.searchsorted(index.values, close_times, side='right')
+    has_bars = (ends > starts) & (open_times >= excursion_index['start']) & (close_times < excursion_index['end'])
+    buys = np.asarray(types) == 'buy'
+    open_prices = to_pipettes(open_prices, symbol)
+
+    low_keys = query_range_extremes(excursion_index['lows'], starts[has_bars], ends[has_bars])
+    high_keys = query_range_extremes(excursion_index['highs'], starts[has_bars], ends[has_bars])
+    lows, low_times = low_keys >> 32, index.values[low_keys & _POSITION_MASK] - open_times[has_bars]
+    highs, high_times = high_keys >> 32, index.values[_POSITION_MASK - (high_keys & _POSITION_MASK)] - open_times[has_bars]
+    open_prices, buys = open_prices[has_bars], buys[has_bars]
+
+    excursions = {
+        'MAE Pips': np.full(len(starts), np.nan),
+        'MFE Pips': np.full(len(starts), np.nan),
+        'Time to MAE': np.full(len(starts), np.timedelta64('NaT'), dtype=low_times.dtype),
+        'Time to MFE': np.full(len(starts), np.timedelta64('NaT'), dtype=low_times.dtype)
+    }
+    excursions['MAE Pips'][has_bars] = np.where(buys, lows - open_prices, open_prices - highs) / PIPETTES_PER_PIP
+    excursions['MFE Pips'][has_bars] = np.where(buys, highs - open_prices, open_prices - lows) / PIPETTES_PER_PIP
+    excursions['Time to MAE'][has_bars] = np.where(buys, low_times, high_times)
+    excursions['Time to MFE'][has_bars] = np.where(buys, high_times, low_times)
+    return pd.DataFrame(excursions)
+
+def calculate_covered_excursions(open_times, close_times, types, open_prices, excursion_indexes=None, symbol=DEFAULT_SYMBOL):
+    """
+    Calculates the excursions of many positions, each on the finest of EXCURSION_TIMEFRAMES whose bars cover it.
+    Every position is first measured on the finest timeframe; the ones it does not cover are measured again on the
+    next timeframe, and so on, so a coarser index is only built when some position needs it.
+    Args:
+        open_times (array-like): Opening time of each position.
+        close_times (array-like): Closing time of each position.
+        types (array-like): 'buy' or 'sell' for each position.
+        open_prices (array-like): Opening price of each position, as a float price or as pipettes.
+        excursion_indexes (dict, optional): Indexes built by build_excursion_index, by timeframe. Defaults to the
+            shared indexes.
+        symbol (str): Symbol the prices are quoted for.
+    Returns:
+        pd.DataFrame: The TRADE_EXCURSION_COLUMNS for each position; NaN/NaT for positions no timeframe covers.
+    """
+    open_times, close_times = np.asarray(open_times), np.asarray(close_times)
+    types, open_prices = np.asarray(types), np.asarray(open_prices)
+    excursions = None
+    uncovered = np.arange(len(open_times))
+    for timeframe in EXCURSION_TIMEFRAMES:
+        excursion_index = excursion_indexes[timeframe] if excursion_indexes is not None else get_shared_excursion_index(timeframe, symbol)
+        measured = calculate_excursions(
+            open_times[uncovered], close_times[uncovered], types[uncovered], open_prices[uncovered], excursion_index, symbol
+        )
+        if excursions is None:
+            excursions = measured
         else:
-            max_drawdown = (open_price - trade_ohlc_data['High'].max()) * 10000
-        
-        drawdowns.append({
-            'Signal Group': trade['Signal Group'],
-            'Max Pip Drawdown': max_drawdown
-        })
-    
-    return pd.DataFrame(drawdowns)
+            for column in TRADE_EXCURSION_COLUMNS:
+                values = excursions[column].values.copy()
+                values[uncovered] = measured[column].values
+                excursions[column] = values
+        uncovered = np.flatnonzero(excursions['MAE Pips'].isna().values)
+        if not len(uncovered):
+            break
+    return excursions
+
+def calculate_trade_excursions(trade_data, excursion_indexes=None, symbol=DEFAULT_SYMBOL):
+    """
+    Calculates the maximum adverse and favourable excursion of every trade on the finest bars covering it.
+    Args:
+        trade_data (pd.DataFrame): DataFrame containing the trade data.
+        excursion_indexes (dict, optional): Indexes built by build_excursion_index, by timeframe. Defaults to the
+            shared indexes.
+        symbol (str): Symbol the prices are quoted for.
+    Returns:
+        pd.DataFrame: The TRADE_EXCURSION_COLUMNS, aligned with trade_data's rows.
+    """
+    excursions = calculate_covered_excursions(
+        trade_data['Open DateTime'].values, trade_data['Close DateTime'].values,
+        trade_data['Type'].values, trade_data['Opening Price'].values, excursion_indexes, symbol
+    )
+    excursions.index = trade_data.index
+    return excursions
+
+def calculate_signal_excursions(trade_data, excursion_indexes=None, symbol=DEFAULT_SYMBOL):
+    """
+    Calculates the maximum adverse and favourable excursion of every signal basket on the finest bars covering it.
+    A basket is measured from its first trade's open to its last close, against the opening price of its first trade,
+    the reference the pips-away statistics use.
+    Args:
+        trade_data (pd.DataFrame): DataFrame containing the trade data, grouped by group_trades_into_signals.
+        excursion_indexes (dict, optional): Indexes built by build_excursion_index, by timeframe. Defaults to the
+            shared indexes.
+        symbol (str): Symbol the prices are quoted for.
+    Returns:
+        pd.DataFrame: One row per signal with its Signal Group and the TRADE_EXCURSION_COLUMNS, ordered by Signal Group.
+    """
+    signals = trade_data.groupby('Signal Group').first().reset_index()
+    excursions = calculate_covered_excursions(
+        signals['Signal Open Time'].values, signals['Signal Close Time'].values,
+        signals['Type'].values, signals['Signal First Price'].values, excursion_indexes, symbol
+    )
+    excursions.insert(0, 'Signal Group', signals['Signal Group'].values)
+    return excursions
+
+def calculate_basket_curves(trade_data, tf_ohlc_data, symbol=DEFAULT_SYMBOL):
+    """
+    Calculates the floating P&L and net exposure of every signal's basket of open trades at the close of each bar
+    from the signal's first open to its close.
+    A trade counts from the bar containing its open up to, but not including, the bar containing its close, at whose
+    close it is realized. The open lots and their cost are accumulated over all signals at once from difference arrays,
+    in integer hundredths of a lot and pipettes, so the curves are exact and take time linear in trades plus bars.
+    Args:
+        trade_data (pd.DataFrame): DataFrame containing the trade data, grouped by group_trades_into_signals.
+        tf_ohlc_data (pd.DataFrame): OHLC data covering the trades.
+        symbol (str): Symbol the prices are quoted for.
+    Returns:
+        pd.DataFrame: One row per signal and bar with the Signal Group, the bar's DateTime and position (Bar), the
+            basket's Net Exposure in lots (negative when net short) and its Floating P&L in the quote currency.
+    """
+    trade_bars = _trade_bar_positions(trade_data, tf_ohlc_data)
+    order = np.argsort(trade_data['Signal Group'].values, kind='stable')
+    groups = trade_data['Signal Group'].values[order]
+    open_bars = np.clip(trade_bars['Open Bar'][order], 0, len(tf_ohlc_data) - 1)
+    close_bars = np.clip(trade_bars['Close Bar'][order], 0, len(tf_ohlc_data) - 1)
+
+    new_signal = np.ones(len(groups), dtype=bool)
+    new_signal[1:] = groups[1:] != groups[:-1]
+    starts = np.flatnonzero(new_signal)
+    counts = np.diff(np.append(starts, len(groups)))
+
+    # Every signal gets its own run of rows on one flat axis, one row per bar from its first open to its last close
+    first_bars = np.minimum.reduceat(open_bars, starts)
+    last_bars = np.maximum.reduceat(close_bars, starts)
+    lengths = last_bars - first_bars + 1
+    offsets = np.cumsum(lengths) - lengths
+    row_count = int(lengths.sum())
+    trade_offsets = np.repeat(offsets - first_bars, counts)
+
+    directions = np.where(trade_data['Type'].values[order] == 'buy', 1, -1)
+    signed_lots = directions * np.rint(trade_data['Volume'].values[order] * 100).astype(np.int64)
+    costs = signed_lots * to_pipettes(trade_data['Opening Price'].values[order], symbol)
+    # Each trade adds its lots and cost at its open bar and removes them at its close bar
+    positions = np.concatenate((trade_offsets + open_bars, trade_offsets + close_bars))
+    exposure = np.cumsum(np.rint(np.bincount(positions, np.concatenate((signed_lots, -signed_lots)), row_count + 1)).astype(np.int64))[:-1]
+    cost = np.cumsum(np.rint(np.bincount(positions, np.concatenate((costs, -costs)), row_count + 1)).astype(np.int64))[:-1]
+
+    bars = np.arange(row_count) - np.repeat(offsets - first_bars, lengths)
+    closes = to_pipettes(tf_ohlc_data['Close'].values, symbol)[bars]
+    return pd.DataFrame({
+        'Signal Group': np.repeat(groups[starts], lengths),
+        'DateTime': tf_ohlc_data.index.values[bars],
+        'Bar': bars,
+        'Net Exposure': exposure / 100,
+        'Floating P&L': (exposure * closes - cost) * CONTRACT_SIZES[symbol] / (100 * price_scale(symbol))
+    })
+
+def calculate_equity_curve(trade_data, tf_ohlc_data, starting_balance=0.0, symbol=DEFAULT_SYMBOL):
+    """
+    Calculates the account's equity at the close of each bar from the first trade's open to the last trade's close,
+    and its running drawdown from the highest equity reached so far. Trades of different sources are separate
+    accounts, so they are refused here; calculate one curve per source instead.
+    The account is treated as a single basket of every open trade, so its floating P&L comes from
+    calculate_basket_curves. Trade events are merged onto the same bars: commission is charged at the bar containing
+    a trade's open, and profit and swap are realized at the bar containing its close.
+    Args:
+        trade_data (pd.DataFrame): DataFrame containing the trade data, including Profit, Commission and Swap.
+        tf_ohlc_data (pd.DataFrame): OHLC data covering the trades.
+        starting_balance (float): Account balance before the first trade.
+        symbol (str): Symbol the prices are quoted for.
+    Returns:
+        pd.DataFrame: DataFrame indexed by DateTime with the Balance, Floating P&L, Equity, Peak Equity and Drawdown
+            (equity minus peak equity, zero or negative) at each bar.
+    Raises:
+        ValueError: If trade_data holds trades of more than one source.
+    """
+    if 'Source' in trade_data and trade_data['Source'].nunique() > 1:
+        raise ValueError("Trades of several sources are separate accounts; calculate one equity curve per source.")
+    basket_curve = calculate_basket_curves(trade_data.assign(**{'Signal Group': 0}), tf_ohlc_data, symbol)
+    trade_bars = _trade_bar_positions(trade_data, tf_ohlc_data)
+    first_bar = basket_curve['Bar'].values[0] if len(basket_curve) else 0
+    open_rows = np.clip(trade_bars['Open Bar'], 0, len(tf_ohlc_data) - 1) - first_bar
+    close_rows = np.clip(trade_bars['Close Bar'], 0, len(tf_ohlc_data) - 1) - first_bar
+
+    # Balance changes of every trade event, summed per bar and accumulated in one pass
+    balance_changes = (
+        np.bincount(open_rows, trade_data['Commission'].values, len(basket_curve))
+        + np.bincount(close_rows, trade_data['Profit'].values + trade_data['Swap'].values, len(basket_curve))
+    )
+    balance = starting_balance + np.cumsum(balance_changes)
+    equity = balance + basket_curve['Floating P&L'].values
+    peak_equity = np.maximum.accumulate(equity)
+    return pd.DataFrame({
+        'Balance': balance,
+        'Floating P&L': basket_curve['Floating P&L'].values,
+        'Equity': equity,
+        'Peak Equity': peak_equity,
+        'Drawdown': equity - peak_equity
+    }, index=pd.DatetimeIndex(basket_curve['DateTime'].values, name='DateTime'))
@@ -0,0 +1,13 @@
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+@pytest.fixture
+def repo_root(monkeypatch):
+    """Runs a test from the repository root, where the OHLC_FILES and trades/ paths are resolved."""
+    monkeypatch.chdir(REPO_ROOT)
+    return REPO_ROOT
@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from build import build
+from helpers import ingest_appended_bars, _file_content_hash
+from test_ingest import LINES, write_raw
+
+@pytest.fixture
+def project(tmp_path):
+    raw_path, converted_path = str(tmp_path / 'GUM1.csv'), str(tmp_path / 'GUM1_OHLC_dropnaCSV.csv')
+    targets = {converted_path: {'inputs': [raw_path], 'action': 'ohlc'}}
+    state_path = str(tmp_path / 'build_state.json')
+    write_raw(raw_path, b''.join(LINES[:100]))
+    assert build(targets, state_path, max_workers=1) == [converted_path]
+    return raw_path, converted_path, targets, state_path
+
+def full_conversion(tmp_path, raw_path):
+    reference_raw, reference_converted = str(tmp_path / 'reference.csv'), str(tmp_path / 'reference_OHLC.csv')
+    with open(raw_path, 'rb') as f, open(reference_raw, 'wb') as g:
+        g.write(f.read())
+    ingest_appended_bars(reference_raw, reference_converted, full=True)
+    with open(reference_converted, 'rb') as f:
+        return f.read()
+
+def read_bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+def test_current_target_is_skipped_and_grown_input_appended(tmp_path, project):
+    raw_path, converted_path, targets, state_path = project
+    assert build(targets, state_path, max_workers=1) == []
+
+    write_raw(raw_path, b''.join(LINES[:300]))
+    assert build(targets, state_path, max_workers=1) == [converted_path]
+    assert read_bytes(converted_path) == full_conversion(tmp_path, raw_path)
+    assert build(targets, state_path, max_workers=1) == []
+
+def test_edited_output_is_rebuilt_whole(tmp_path, project):
+    raw_path, converted_path, targets, state_path = project
+    with open(converted_path, 'ab') as f:
+        f.write(b'2030-01-01 00:00:00,1.0,1.0,1.0,1.0,1\n')
+    assert build(targets, state_path, max_workers=1) == [converted_path]
+    assert read_bytes(converted_path) == full_conversion(tmp_path, raw_path)
+
+    # An edited output is not appended to when the input grew at the same time either
+    with open(converted_path, 'ab') as f:
+        f.write(b'2030-01-01 00:00:00,1.0,1.0,1.0,1.0,1\n')
+    write_raw(raw_path, b''.join(LINES[:300]))
+    assert build(targets, state_path, max_workers=1) == [converted_path]
+    assert read_bytes(converted_path) == full_conversion(tmp_path, raw_path)
+
+def test_forced_target_is_rebuilt_whole(tmp_path, project):
+    raw_path, converted_path, targets, state_path = project
+    # An edit the build state does not know about, so only force brings the output back
+    with open(converted_path, 'ab') as f:
+        f.write(b'2030-01-01 00:00:00,1.0,1.0,1.0,1.0,1\n')
+    with open(state_path) as f:
+        state = json.load(f)
+    state['targets'][converted_path]['output'] = _file_content_hash(converted_path)
+    with open(state_path, 'w') as f:
+        json.dump(state, f)
+
+    assert build(targets, state_path, max_workers=1) == []
+    assert build(targets, state_path, force=True, max_workers=1) == [converted_path]
+    assert read_bytes(converted_path) == full_conversion(tmp_path, raw_path)
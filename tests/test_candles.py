@@ -0,0 +1,24 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from helpers import DISPLAY_TIMEZONE, TIMEFRAME_MINUTES, align_datetime_to_candle, align_datetimes_to_candles, load_ohlc, load_trade_data
+
+@pytest.mark.parametrize('timeframe', ['4H', '1D'])
+def test_trade_times_align_to_exported_bars(repo_root, timeframe):
+    trade_data = load_trade_data('trades/trade_0.csv')
+    aligned = align_datetimes_to_candles(trade_data['Open DateTime'], TIMEFRAME_MINUTES[timeframe])
+    assert aligned.isin(load_ohlc(timeframe).index).all()
+
+def test_long_bars_start_on_source_midnight_in_summer():
+    # 01:00 London in summer is midnight UTC, where the exported H4 and D1 bars start
+    assert align_datetime_to_candle(pd.Timestamp('2024-05-15 03:30'), 240) == pd.Timestamp('2024-05-15 01:00')
+    assert align_datetime_to_candle(pd.Timestamp('2024-05-15 00:30'), 1440) == pd.Timestamp('2024-05-14 01:00')
+    assert align_datetime_to_candle(pd.Timestamp('2024-01-15 03:30'), 240) == pd.Timestamp('2024-01-15 00:00')
+    # Counted from the display zone's own midnight on request
+    assert align_datetime_to_candle(pd.Timestamp('2024-05-15 03:30'), 240, session_tz=DISPLAY_TIMEZONE) == pd.Timestamp('2024-05-15 00:00')
+
+@pytest.mark.parametrize('timeframe', [1, 5, 15, 30, 60])
+def test_short_bars_match_scalar_floor(timeframe):
+    datetimes = pd.DatetimeIndex(np.datetime64('2024-03-25') + np.random.default_rng(timeframe).integers(0, 60 * 24 * 30, 1000).astype('timedelta64[m]'))
+    assert align_datetimes_to_candles(datetimes, timeframe).equals(datetimes.floor(f'{timeframe}min'))
@@ -0,0 +1,49 @@
+import pandas as pd
+import pytest
+
+from helpers import (
+    calculate_max_pip_drawdown, calculate_signal_statistics, calculate_trade_excursions, group_trades_into_signals,
+    load_ohlc
+)
+
+def make_trades(rows):
+    open_times, close_times, types, open_prices = zip(*rows)
+    return pd.DataFrame({
+        'Open DateTime': pd.to_datetime(open_times),
+        'Close DateTime': pd.to_datetime(close_times),
+        'Type': types,
+        'Volume': 0.5,
+        'Opening Price': open_prices
+    })
+
+@pytest.fixture
+def trade_data():
+    return make_trades([
+        # Years before the M1 export starts; only 5M, 1H and 4H cover it
+        ('2010-03-01 10:00', '2010-03-12 16:00', 'buy', 1.50000),
+        # Within the M1 export
+        ('2024-03-01 10:00', '2024-03-01 12:00', 'sell', 1.26000),
+        # Opened before the M1 export starts and closed inside it
+        ('2023-12-29 10:00', '2024-01-03 12:00', 'sell', 1.27000)
+    ])
+
+def test_trades_outside_m1_fall_back_to_finest_covering_timeframe(repo_root, trade_data):
+    excursions = calculate_trade_excursions(trade_data)
+    drawdowns = {
+        timeframe: calculate_max_pip_drawdown(trade_data.assign(**{'Signal Group': [1, 2, 3]}), load_ohlc(timeframe))['Max Pip Drawdown'].values
+        for timeframe in ['1M', '5M']
+    }
+    assert not excursions['MAE Pips'].isna().any()
+    assert excursions['MAE Pips'].iloc[0] == drawdowns['5M'][0]
+    assert excursions['MAE Pips'].iloc[1] == drawdowns['1M'][1]
+    # M1 only holds the end of the third trade, so it is measured on 5M as a whole
+    assert excursions['MAE Pips'].iloc[2] == drawdowns['5M'][2]
+    assert (excursions['Time to MAE'] >= pd.Timedelta(0)).all()
+
+def test_signal_statistics_keep_drawdown_before_m1(repo_root, trade_data):
+    trade_data = group_trades_into_signals(trade_data)
+    trade_data = trade_data.assign(**calculate_trade_excursions(trade_data))
+    signal_statistics = calculate_signal_statistics(trade_data)
+    assert not signal_statistics[['Max Pip Drawdown', 'Basket MAE Pips', 'Basket MFE Pips']].isna().any().any()
+    # The 2010 buy is a signal of its own, so its basket is the trade itself
+    assert signal_statistics['Max Pip Drawdown'].iloc[0] == signal_statistics['Basket MAE Pips'].iloc[0] == -219.5
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import helpers
+from helpers import calculate_bollinger_bands, calculate_rsi, clear_indicator_cache, get_indicator_window, indicator_lookback
+
+def assert_same_values(windowed, full):
+    assert windowed.index.equals(full.index)
+    assert np.array_equal(windowed.values, full.values, equal_nan=True)
+
+@pytest.fixture(scope='module')
+def tf_ohlc_data():
+    # A random walk longer than two rolling chunks, so windows cross chunk boundaries
+    rng = np.random.default_rng(0)
+    closes = 1.25 + np.cumsum(rng.normal(0, 0.0002, 3 * helpers.ROLLING_CHUNK_ROWS + 123))
+    index = pd.DatetimeIndex(np.datetime64('2024-01-01') + np.arange(len(closes)).astype('timedelta64[m]'), name='DateTime')
+    return pd.DataFrame({'Open': closes, 'High': closes + 0.0003, 'Low': closes - 0.0003, 'Close': closes, 'Volume': 1}, index=index)
+
+@pytest.fixture(autouse=True)
+def empty_indicator_cache():
+    clear_indicator_cache()
+    yield
+    clear_indicator_cache()
+
+def random_windows(row_count, lookback, seed):
+    rng = np.random.default_rng(seed)
+    # Windows starting inside the look-back of the first bar, anywhere, and reaching the last bar
+    starts = np.concatenate((rng.integers(0, lookback + 1, 5), rng.integers(0, row_count - 1, 20), [0, row_count - 50]))
+    lengths = rng.integers(1, 5000, len(starts))
+    return [(int(start), int(min(start + length, row_count))) for start, length in zip(starts, lengths)] + [(0, row_count)]
+
+@pytest.mark.parametrize('period', [2, 14, 21, 100])
+def test_rsi_window_matches_full_history(tf_ohlc_data, period):
+    full = calculate_rsi(tf_ohlc_data, period)
+    for start_row, end_row in random_windows(len(tf_ohlc_data), indicator_lookback('RSI', period), period):
+        windowed = get_indicator_window(tf_ohlc_data, '1M', 'RSI', start_row, end_row, period)
+        assert_same_values(windowed, full.iloc[start_row:end_row])
+
+@pytest.mark.parametrize('period, num_of_std', [(2, 2), (20, 2), (50, 2.5)])
+def test_bollinger_window_matches_full_history(tf_ohlc_data, period, num_of_std):
+    full = calculate_bollinger_bands(tf_ohlc_data, period, num_of_std)
+    for start_row, end_row in random_windows(len(tf_ohlc_data), indicator_lookback('Bollinger Bands', period, num_of_std), period):
+        windowed = get_indicator_window(tf_ohlc_data, '1M', 'Bollinger Bands', start_row, end_row, period, num_of_std)
+        assert len(windowed) == 3
+        for windowed_band, full_band in zip(windowed, full):
+            assert_same_values(windowed_band, full_band.iloc[start_row:end_row])
+
+def test_window_is_computed_over_lookback_only(tf_ohlc_data, monkeypatch):
+    lengths = []
+    calculate = helpers.INDICATORS['RSI']['function']
+    monkeypatch.setitem(helpers.INDICATORS['RSI'], 'function', lambda data, period: lengths.append(len(data)) or calculate(data, period))
+    get_indicator_window(tf_ohlc_data, '1M', 'RSI', 1000, 1500, 14)
+    get_indicator_window(tf_ohlc_data, '1M', 'RSI', 5, 20, 14)
+    assert lengths == [500 + 14, 20]
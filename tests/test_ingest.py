@@ -0,0 +1,105 @@
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import REPO_ROOT
+from helpers import _ensure_ohlc_cache, ingest_appended_bars, load_tick_data
+
+# The last minutes of January and the first of February 2024 from the M1 export
+with open(os.path.join(REPO_ROOT, 'GUM1.csv'), 'rb') as f:
+    RAW_LINES = f.read().splitlines(keepends=True)
+HEADER = RAW_LINES[0]
+JANUARY_END = next(position for position, line in enumerate(RAW_LINES) if line.startswith(b'20240201'))
+LINES = RAW_LINES[JANUARY_END - 300:JANUARY_END + 200]
+
+def write_raw(path, data):
+    with open(path, 'wb') as f:
+        f.write(HEADER + data)
+
+def assert_matches_full_conversion(tmp_path, raw_path, converted_path):
+    """The converted CSV and its cache must equal a from-scratch conversion of the same raw file."""
+    reference_dir = tempfile.mkdtemp(dir=tmp_path)
+    reference_raw, reference_converted = os.path.join(reference_dir, 'raw.csv'), os.path.join(reference_dir, 'converted.csv')
+    with open(raw_path, 'rb') as f:
+        data = f.read()
+    with open(reference_raw, 'wb') as f:
+        f.write(data[:data.rfind(b'\n') + 1])
+    assert ingest_appended_bars(reference_raw, reference_converted) == -1
+
+    with open(converted_path, 'rb') as f, open(reference_converted, 'rb') as g:
+        assert f.read() == g.read()
+    cached, expected = load_tick_data(converted_path), load_tick_data(reference_converted, use_cache=False)
+    # Cached columns may be memory maps, which assert_frame_equal tells apart from arrays
+    pd.testing.assert_frame_equal(cached.apply(np.asarray), expected)
+
+@pytest.fixture
+def ingested(tmp_path):
+    raw_path, converted_path = str(tmp_path / 'raw.csv'), str(tmp_path / 'converted.csv')
+    write_raw(raw_path, b''.join(LINES[:100]))
+    assert ingest_appended_bars(raw_path, converted_path) == -1
+    # Build the cache, so later appends extend it instead of rebuilding it
+    load_tick_data(converted_path)
+    return raw_path, converted_path
+
+def test_append_within_current_month(tmp_path, ingested):
+    raw_path, converted_path = ingested
+    _, manifest = _ensure_ohlc_cache(converted_path)
+    assert [partition['name'] for partition in manifest['partitions']] == ['2024-01']
+
+    write_raw(raw_path, b''.join(LINES[:250]))
+    assert ingest_appended_bars(raw_path, converted_path) == 150
+    _, manifest = _ensure_ohlc_cache(converted_path)
+    assert [partition['name'] for partition in manifest['partitions']] == ['2024-01']
+    assert manifest['rows'] == 250
+    # Extended in place rather than rebuilt, which would have recorded the content hash
+    assert manifest['sha1'] is None
+    assert ingest_appended_bars(raw_path, converted_path) == 0
+    assert_matches_full_conversion(tmp_path, raw_path, converted_path)
+
+def test_partial_last_line_waits_for_its_newline(tmp_path, ingested):
+    raw_path, converted_path = ingested
+    partial_line = LINES[350][:12]
+    # The export is still being written: only complete lines past the month boundary are ingested
+    write_raw(raw_path, b''.join(LINES[:350]) + partial_line)
+    assert ingest_appended_bars(raw_path, converted_path) == 250
+    _, manifest = _ensure_ohlc_cache(converted_path)
+    assert [partition['name'] for partition in manifest['partitions']] == ['2024-01', '2024-02']
+    assert_matches_full_conversion(tmp_path, raw_path, converted_path)
+
+    write_raw(raw_path, b''.join(LINES))
+    assert ingest_appended_bars(raw_path, converted_path) == 150
+    assert_matches_full_conversion(tmp_path, raw_path, converted_path)
+
+def test_rewritten_raw_file_is_converted_again(tmp_path, ingested):
+    raw_path, converted_path = ingested
+    # The first bar's Close is changed and more bars are added: not an append
+    fields = LINES[0].split(b',')
+    fields[5] = b'1.11111'
+    write_raw(raw_path, b','.join(fields) + b''.join(LINES[1:200]))
+    assert ingest_appended_bars(raw_path, converted_path) == -1
+    assert load_tick_data(converted_path)['Close'].iloc[0] == 1.11111
+    assert_matches_full_conversion(tmp_path, raw_path, converted_path)
+
+    # A raw file that shrank is converted again as well
+    write_raw(raw_path, b''.join(LINES[:50]))
+    assert ingest_appended_bars(raw_path, converted_path) == -1
+    assert_matches_full_conversion(tmp_path, raw_path, converted_path)
+
+def test_edited_converted_file_is_not_appended_to(tmp_path, ingested):
+    raw_path, converted_path = ingested
+    with open(converted_path, 'rb') as f:
+        lines = f.read().splitlines(keepends=True)
+    with open(converted_path, 'wb') as f:
+        f.write(b''.join(lines[:-10]))
+    write_raw(raw_path, b''.join(LINES[:200]))
+    assert ingest_appended_bars(raw_path, converted_path) == -1
+    assert_matches_full_conversion(tmp_path, raw_path, converted_path)
+
+def test_full_ingest_converts_unchanged_raw_file(tmp_path, ingested):
+    raw_path, converted_path = ingested
+    assert ingest_appended_bars(raw_path, converted_path, full=True) == -1
+    assert ingest_appended_bars(raw_path, converted_path) == 0
+    assert_matches_full_conversion(tmp_path, raw_path, converted_path)
@@ -0,0 +1,85 @@
+import os
+import shutil
+import threading
+
+import numpy as np
+import pandas as pd
+
+import helpers
+from helpers import OHLC_CSV_DTYPES, load_tick_data, resample_ohlc, _ensure_ohlc_cache, _ohlc_cache_path, _read_ohlc_rows
+
+def write_csv(path, text):
+    path.write_text(text)
+    return str(path)
+
+def assert_empty_ohlc(tf_ohlc_data):
+    assert len(tf_ohlc_data) == 0
+    assert tf_ohlc_data.index.name == 'DateTime'
+    assert tf_ohlc_data.index.dtype == np.dtype('datetime64[s]')
+    assert tf_ohlc_data.dtypes.to_dict() == {column: np.dtype(dtype) for column, dtype in OHLC_CSV_DTYPES.items()}
+
+def test_header_only_csv_loads_as_empty_frame(tmp_path):
+    file_path = write_csv(tmp_path / 'empty.csv', 'DateTime,Open,High,Low,Close,Volume\n')
+    assert_empty_ohlc(load_tick_data(file_path, use_cache=False))
+    # Written once, then read back from the cache without partitions
+    assert_empty_ohlc(load_tick_data(file_path))
+    assert_empty_ohlc(load_tick_data(file_path))
+
+def test_header_only_raw_export_loads_as_empty_frame(tmp_path):
+    file_path = write_csv(tmp_path / 'raw.csv', 'Date,Time,Open,High,Low,Close,Volume\n')
+    assert_empty_ohlc(load_tick_data(file_path))
+
+def test_empty_cache_reads_any_row_range(tmp_path):
+    file_path = write_csv(tmp_path / 'empty.csv', 'DateTime,Open,High,Low,Close,Volume\n')
+    cache_path, manifest = _ensure_ohlc_cache(file_path)
+    assert manifest['partitions'] == []
+    assert_empty_ohlc(_read_ohlc_rows(cache_path, manifest, 0, 10))
+
+def test_cache_round_trips_monthly_partitions(tmp_path):
+    file_path = write_csv(tmp_path / 'bars.csv', (
+        'DateTime,Open,High,Low,Close,Volume\n'
+        '2024-01-31 23:58:00,1.27,1.28,1.26,1.275,10\n'
+        '2024-01-31 23:59:00,1.275,1.28,1.27,1.271,11\n'
+        '2024-02-01 00:00:00,1.271,1.29,1.27,1.285,12\n'
+    ))
+    cached = load_tick_data(file_path)
+    pd.testing.assert_frame_equal(cached, load_tick_data(file_path, use_cache=False))
+    _, manifest = _ensure_ohlc_cache(file_path)
+    assert [partition['rows'] for partition in manifest['partitions']] == [2, 1]
+
+def test_timeframes_sharing_a_cache_build_it_concurrently(tmp_path, monkeypatch):
+    # Two months of minute bars; 30M and 2H are resampled from them, so all three build the same base cache
+    datetimes = np.datetime64('2024-01-01') + np.arange(0, 60 * 1440, dtype='timedelta64[m]')
+    close = 1.27 + np.cumsum(np.random.default_rng(0).normal(0, 1e-4, len(datetimes))).round(5)
+    bars = pd.DataFrame({'Open': close, 'High': close + 1e-4, 'Low': close - 1e-4, 'Close': close, 'Volume': 1},
+                        index=pd.DatetimeIndex(datetimes, name='DateTime'))
+    file_path = str(tmp_path / 'GUM1.csv')
+    bars.to_csv(file_path)
+    monkeypatch.setattr(helpers, 'OHLC_FILES', {'1M': file_path})
+    timeframes = ['1M', '30M', '2H']
+
+    for _ in range(3):
+        shutil.rmtree(tmp_path / '.ohlc_cache', ignore_errors=True)
+        barrier = threading.Barrier(len(timeframes))
+        results, errors = {}, []
+
+        def load(timeframe):
+            barrier.wait()
+            try:
+                cache_path, manifest = helpers._ensure_timeframe_cache(timeframe)
+                results[timeframe] = _read_ohlc_rows(cache_path, manifest, 0, manifest['rows']).apply(np.asarray)
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=load, args=(timeframe,)) for timeframe in timeframes]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        base = load_tick_data(file_path, use_cache=False)
+        pd.testing.assert_frame_equal(results['1M'], base)
+        for timeframe in ['30M', '2H']:
+            pd.testing.assert_frame_equal(results[timeframe], resample_ohlc(base, helpers.timeframe_to_minutes(timeframe)))
+        assert not [name for name in os.listdir(_ohlc_cache_path(file_path)) if name.endswith('.tmp')]
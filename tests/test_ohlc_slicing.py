@@ -0,0 +1,65 @@
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import helpers
+from helpers import OHLC_FILES, TRADE_BAR_COLUMNS, build_trade_bar_index, slice_ohlc_around_trades
+
+def slice_ohlc(tf_ohlc_data, start, end, bars_before=0, bars_after=0):
+    """Reference slice: the bars from the one containing start to the one containing end, located by datetime."""
+    index = tf_ohlc_data.index
+    start_row = index.searchsorted(pd.Timestamp(start), side='right') - 1
+    end_row = index.searchsorted(pd.Timestamp(end), side='right')
+    return tf_ohlc_data.iloc[max(start_row - bars_before, 0):min(end_row + bars_after, len(index))]
+
+@pytest.fixture
+def ohlc_cache(tmp_path):
+    # Five-minute bars from late January into February, so slices cross a partition boundary
+    index = pd.DatetimeIndex(np.datetime64('2024-01-31') + np.arange(0, 5000, 5).astype('timedelta64[m]'), name='DateTime')
+    tf_ohlc_data = pd.DataFrame({'Close': np.arange(len(index), dtype=float)}, index=index)
+    file_path = str(tmp_path / 'bars.csv')
+    tf_ohlc_data.to_csv(file_path)
+    cache_path = str(tmp_path / 'cache')
+    helpers._write_ohlc_cache(cache_path, tf_ohlc_data, file_path)
+    return (cache_path, helpers._read_cache_manifest(cache_path)), tf_ohlc_data
+
+@pytest.mark.parametrize('bars_before, bars_after', [(0, 0), (5, 5), (50, 0), (2000, 2000)])
+def test_slice_around_trades_matches_datetime_slice(ohlc_cache, bars_before, bars_after):
+    ohlc_cache, tf_ohlc_data = ohlc_cache
+    rng = np.random.default_rng(bars_before)
+    for _ in range(50):
+        open_times = np.datetime64('2024-01-31') + np.sort(rng.integers(0, 5000, 3)).astype('timedelta64[m]')
+        trade_data = pd.DataFrame({'Open DateTime': open_times, 'Close DateTime': open_times + np.timedelta64(37, 'm')})
+        trade_data = trade_data.assign(**build_trade_bar_index(trade_data, tf_ohlc_data))
+
+        sliced, rebased = slice_ohlc_around_trades(ohlc_cache, trade_data, bars_before, bars_after)
+        expected = slice_ohlc(tf_ohlc_data, open_times.min(), trade_data['Close DateTime'].max(), bars_before, bars_after)
+        # Rows read from the cache may be memory maps, which assert_frame_equal tells apart from arrays
+        pd.testing.assert_frame_equal(sliced.apply(np.asarray), expected)
+        # Rebased positions locate the same bars in the slice; First Bar may lie one past it
+        assert (rebased['First Bar'] - rebased['Open Bar'] == trade_data['First Bar'] - trade_data['Open Bar']).all()
+        for column in ['Open Bar', 'Close Bar']:
+            assert (sliced.index[rebased[column]] == tf_ohlc_data.index[trade_data[column]]).all()
+
+def test_persisted_trade_bars_follow_the_cached_bars(repo_root, tmp_path, monkeypatch):
+    path = str(tmp_path / 'trade_0.csv')
+    shutil.copy('trades/trade_0.csv', path)
+    source_files = [path, OHLC_FILES['4H']]
+    trade_bars = helpers._load_trade_bar_index(path, '4H', source_files)
+
+    # Positions persisted under an outdated key, as before a cache version bump, are rebuilt rather than reused
+    key = helpers._trade_bar_index_key('4H', source_files)
+    with open(helpers._trade_bars_path(path, '4H'), 'wb') as f:
+        np.savez(f, key=np.array(key.replace('"version": ', '"version": -')),
+                 **{column: np.zeros_like(trade_bars[column]) for column in TRADE_BAR_COLUMNS})
+    reloaded = helpers._load_trade_bar_index(path, '4H', source_files)
+    for column in TRADE_BAR_COLUMNS:
+        np.testing.assert_array_equal(reloaded[column], trade_bars[column])
+
+    # Bars that moved while the CSV kept its size and mtime give a different key
+    cache_path, manifest = helpers._ensure_timeframe_cache('4H')
+    moved = dict(manifest, rows=manifest['rows'] - 1)
+    monkeypatch.setattr(helpers, '_ensure_timeframe_cache', lambda timeframe: (cache_path, moved))
+    assert helpers._trade_bar_index_key('4H', source_files) != key
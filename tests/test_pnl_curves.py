@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from helpers import CONTRACT_SIZES, build_trade_bar_index, calculate_basket_curves, calculate_equity_curve, group_trades_into_signals
+
+@pytest.fixture
+def tf_ohlc_data():
+    rng = np.random.default_rng(0)
+    closes = np.round(1.25 + np.cumsum(rng.integers(-20, 21, 300)) / 100000, 5)
+    index = pd.DatetimeIndex(np.datetime64('2024-03-04 08:00') + np.arange(0, 5 * len(closes), 5).astype('timedelta64[m]'), name='DateTime')
+    return pd.DataFrame({'Open': closes, 'High': closes + 0.0002, 'Low': closes - 0.0002, 'Close': closes, 'Volume': 1}, index=index)
+
+@pytest.fixture
+def trade_data(tf_ohlc_data):
+    rng = np.random.default_rng(1)
+    count = 40
+    # Minute-resolution times, so trades open and close inside bars as well as on their boundaries
+    open_minutes = np.sort(rng.integers(0, 1200, count))
+    open_times = tf_ohlc_data.index[0] + pd.to_timedelta(open_minutes, unit='m')
+    close_times = open_times + pd.to_timedelta(rng.integers(0, 200, count), unit='m')
+    trade_data = pd.DataFrame({
+        'Open DateTime': open_times,
+        'Close DateTime': close_times,
+        'Type': np.where(rng.integers(0, 3, count) > 0, 'buy', 'sell'),
+        'Volume': rng.integers(1, 30, count) / 10,
+        'Opening Price': np.round(1.25 + rng.integers(-300, 300, count) / 100000, 5),
+        'Profit': np.round(rng.normal(0, 20, count), 2),
+        'Commission': -2.5,
+        'Swap': np.where(rng.integers(0, 4, count) == 0, -0.9, 0.0)
+    })
+    trade_data = group_trades_into_signals(trade_data)
+    return trade_data.assign(**build_trade_bar_index(trade_data, tf_ohlc_data))
+
+def brute_force_curves(trade_data, tf_ohlc_data):
+    """Sums every open trade's exposure and P&L bar by bar, from each signal's first open bar to its last close bar."""
+    rows = []
+    closes = tf_ohlc_data['Close'].values
+    for group, trades in trade_data.groupby('Signal Group'):
+        for bar in range(trades['Open Bar'].min(), trades['Close Bar'].max() + 1):
+            open_trades = trades[(trades['Open Bar'] <= bar) & (bar < trades['Close Bar'])]
+            directions = np.where(open_trades['Type'] == 'buy', 1, -1)
+            lots = directions * open_trades['Volume'].values
+            rows.append({
+                'Signal Group': group,
+                'Bar': bar,
+                'Net Exposure': lots.sum(),
+                'Floating P&L': (lots * (closes[bar] - open_trades['Opening Price'].values)).sum() * CONTRACT_SIZES['GBPUSD']
+            })
+    return pd.DataFrame(rows)
+
+def test_basket_curves_match_brute_force(trade_data, tf_ohlc_data):
+    curves = calculate_basket_curves(trade_data, tf_ohlc_data)
+    expected = brute_force_curves(trade_data, tf_ohlc_data)
+    assert list(curves['Signal Group']) == list(expected['Signal Group'])
+    assert list(curves['Bar']) == list(expected['Bar'])
+    assert (curves['DateTime'].values == tf_ohlc_data.index.values[expected['Bar']]).all()
+    assert np.allclose(curves['Net Exposure'], expected['Net Exposure'], rtol=0, atol=1e-9)
+    assert np.allclose(curves['Floating P&L'], expected['Floating P&L'], rtol=0, atol=1e-6)
+
+def test_basket_curves_without_bar_positions(trade_data, tf_ohlc_data):
+    located = calculate_basket_curves(trade_data.drop(columns=['Open Bar', 'First Bar', 'Close Bar']), tf_ohlc_data)
+    pd.testing.assert_frame_equal(located, calculate_basket_curves(trade_data, tf_ohlc_data))
+
+def test_equity_curve_totals(trade_data, tf_ohlc_data):
+    equity_curve = calculate_equity_curve(trade_data, tf_ohlc_data, starting_balance=1000.0)
+    realized = (trade_data['Profit'] + trade_data['Commission'] + trade_data['Swap']).sum()
+    assert np.isclose(equity_curve['Balance'].iloc[-1], 1000.0 + realized)
+    # Every trade is closed by the last bar
+    assert np.isclose(equity_curve['Floating P&L'].iloc[-1], 0.0)
+    assert (equity_curve['Drawdown'] <= 0).all()
+    assert np.allclose(equity_curve['Equity'], equity_curve['Balance'] + equity_curve['Floating P&L'])
+    assert (equity_curve['Peak Equity'].diff().dropna() >= 0).all()
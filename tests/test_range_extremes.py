@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from helpers import RANGE_INDEX_BLOCK_SIZE, build_range_extreme_index, query_range_extremes
+
+SIZES = [1, 2, 63, 64, 65, 127, 128, 129, 64 * 5 + 3, 64 * 17, 64 * 33 + 1]
+
+def all_ranges(size, rng, count=3000):
+    """Every range of a small array, or random ranges plus every block-edge range of a larger one."""
+    if size * (size + 1) // 2 <= count:
+        starts, ends = np.triu_indices(size + 1, 1)
+        return starts, ends
+    edges = np.unique(np.clip(np.concatenate([np.arange(0, size + 1, RANGE_INDEX_BLOCK_SIZE) + offset for offset in (-1, 0, 1)]), 0, size))
+    edge_starts, edge_ends = np.meshgrid(edges, edges)
+    edge_starts, edge_ends = edge_starts.ravel(), edge_ends.ravel()
+    keep = edge_starts < edge_ends
+    starts = rng.integers(0, size, count)
+    ends = starts + 1 + (rng.integers(0, size, count) % (size - starts))
+    return np.concatenate((starts, edge_starts[keep], [0])), np.concatenate((ends, edge_ends[keep], [size]))
+
+@pytest.mark.parametrize('size', SIZES)
+@pytest.mark.parametrize('reduce', [np.minimum, np.maximum])
+def test_queries_match_brute_force(size, reduce):
+    rng = np.random.default_rng(size)
+    # Integer prices with many ties, as pipettes would have
+    values = rng.integers(-50, 50, size).astype(np.int64)
+    range_index = build_range_extreme_index(values, reduce)
+    starts, ends = all_ranges(size, rng)
+    expected = np.array([reduce.reduce(values[start:end]) for start, end in zip(starts, ends)])
+    assert np.array_equal(query_range_extremes(range_index, starts, ends), expected)
+
+def test_float_values_and_single_bar_ranges():
+    values = np.random.default_rng(1).normal(size=200)
+    range_index = build_range_extreme_index(values, np.minimum)
+    positions = np.arange(200)
+    assert np.array_equal(query_range_extremes(range_index, positions, positions + 1), values)
@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from helpers import OHLC_PRICE_COLUMNS, load_ohlc, resample_ohlc
+
+# London weeks covered by GUM1, starting on the first H4 bar of the Monday
+WEEKS = {
+    'summer': ('2024-05-13 01:00', '2024-05-18 00:59'),
+    'winter': ('2024-01-15 00:00', '2024-01-19 23:59')
+}
+
+@pytest.mark.parametrize('week', WEEKS)
+def test_4h_resample_matches_exported_bars(repo_root, week):
+    start, end = WEEKS[week]
+    resampled = resample_ohlc(load_ohlc('1M', start, end), 240)
+    exported = load_ohlc('4H', start, end)
+    assert len(resampled) == 30
+    assert resampled.index.equals(exported.index)
+    pd.testing.assert_frame_equal(resampled[OHLC_PRICE_COLUMNS], exported[OHLC_PRICE_COLUMNS])
+
+def test_short_resample_counts_from_display_midnight():
+    index = pd.DatetimeIndex(np.datetime64('2024-05-13 00:00') + np.arange(120).astype('timedelta64[m]'), name='DateTime')
+    bars = pd.DataFrame({'Open': 1.0, 'High': 2.0, 'Low': 0.5, 'Close': 1.5, 'Volume': 1}, index=index)
+    resampled = resample_ohlc(bars, 30)
+    assert list(resampled.index.strftime('%H:%M')) == ['00:00', '00:30', '01:00', '01:30']
+    assert (resampled['Volume'] == 30).all()
@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+
+from helpers import calculate_signal_statistics, group_trades_into_signals
+
+def make_trades():
+    open_times = pd.date_range('2024-03-04 09:00', periods=6, freq='15min')
+    return pd.DataFrame({
+        'Open DateTime': open_times,
+        'Close DateTime': open_times + pd.Timedelta(hours=2),
+        'Type': ['buy', 'buy', 'buy', 'sell', 'sell', 'buy'],
+        'Volume': [0.5, 1.0, 1.5, 0.5, 1.0, 0.5],
+        'Opening Price': [1.26500, 1.26400, 1.26250, 1.26300, 1.26420, 1.26100]
+    })
+
+def test_signal_statistics_per_signal():
+    signal_statistics = calculate_signal_statistics(group_trades_into_signals(make_trades()))
+    assert list(signal_statistics['Signal Group']) == [1, 2, 3]
+    assert list(signal_statistics['Type']) == ['buy', 'sell', 'buy']
+    assert list(signal_statistics['Trade Count']) == [3, 2, 1]
+    assert np.allclose(signal_statistics['Volume'], [3.0, 1.5, 0.5])
+    assert list(signal_statistics['Initial Volume']) == [0.5, 0.5, 0.5]
+    # Pips away from each signal's first opening price, compared as exact pipettes
+    assert np.allclose(signal_statistics['Mean Pips Away'], [(0 - 10 - 25) / 3, 6.0, 0.0])
+    assert list(signal_statistics['Median Pips Away']) == [-10.0, 6.0, 0.0]
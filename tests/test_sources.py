@@ -0,0 +1,44 @@
+import shutil
+
+import pandas as pd
+import pytest
+
+from helpers import (
+    build_trade_index, calculate_equity_curve, calculate_signal_statistics, filter_initial_trades,
+    group_trades_into_signals, load_ohlc, load_trade_directory, parse_trade_number_input, select_trade_ranges
+)
+
+@pytest.fixture
+def two_sources(repo_root, tmp_path):
+    # Two runs of the same strategy, numbered independently, so every selected number matches a trade in each
+    shutil.copy('trades/trade_0.csv', tmp_path / 'run_a.csv')
+    shutil.copy('trades/trade_0.csv', tmp_path / 'run_b.csv')
+    trade_data = load_trade_directory(str(tmp_path), max_workers=1)
+    return select_trade_ranges(trade_data, build_trade_index(trade_data), parse_trade_number_input('1-3'))
+
+def signal_summary(trade_data):
+    signal_statistics = calculate_signal_statistics(group_trades_into_signals(trade_data))
+    return signal_statistics.drop(columns='Signal Group').reset_index(drop=True)
+
+def test_sources_never_share_a_signal(two_sources):
+    grouped = group_trades_into_signals(two_sources)
+    assert (grouped.groupby('Signal Group')['Source'].nunique() == 1).all()
+
+    single = two_sources[two_sources['Source'] == 'run_a']
+    per_source = signal_summary(two_sources)
+    expected = signal_summary(single)
+    # Each run holds the same signals as on its own
+    pd.testing.assert_frame_equal(per_source.iloc[:len(expected)].reset_index(drop=True), expected)
+    pd.testing.assert_frame_equal(per_source.iloc[len(expected):].reset_index(drop=True), expected)
+    assert grouped['Signal Volume'].max() == group_trades_into_signals(single)['Signal Volume'].max()
+
+def test_initial_trades_are_kept_per_source(two_sources):
+    initial_trades = filter_initial_trades(two_sources)
+    assert (initial_trades['Source'].value_counts() == len(filter_initial_trades(two_sources[two_sources['Source'] == 'run_a']))).all()
+
+def test_equity_curve_refuses_mixed_sources(two_sources):
+    tf_ohlc_data = load_ohlc('5M')
+    with pytest.raises(ValueError):
+        calculate_equity_curve(two_sources, tf_ohlc_data)
+    curves = {source: calculate_equity_curve(trades, tf_ohlc_data) for source, trades in two_sources.groupby('Source')}
+    pd.testing.assert_frame_equal(curves['run_a'], curves['run_b'])
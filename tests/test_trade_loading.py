@@ -0,0 +1,32 @@
+import shutil
+
+import pandas as pd
+
+import helpers
+from helpers import get_shared_trades, load_trade_data, load_trade_directory
+
+def test_single_file_and_directory_both_tag_source(repo_root, tmp_path):
+    shutil.copy('trades/trade_0.csv', tmp_path / 'run_a.csv')
+    shutil.copy('trades/trade_0.csv', tmp_path / 'run_b.csv')
+
+    single = get_shared_trades(str(tmp_path / 'run_a.csv'))
+    assert (single['Source'] == 'run_a').all()
+    pd.testing.assert_frame_equal(single.drop(columns='Source'), load_trade_data(str(tmp_path / 'run_a.csv')))
+
+    directory = get_shared_trades(str(tmp_path))
+    assert list(directory['Source'].unique()) == ['run_a', 'run_b']
+    pd.testing.assert_frame_equal(directory, load_trade_directory(str(tmp_path), max_workers=1))
+    pd.testing.assert_frame_equal(directory[directory['Source'] == 'run_a'].reset_index(drop=True), single)
+
+def test_trade_times_convert_across_chunks(monkeypatch):
+    # Times around both 2024 clock changes in the broker's zone, split over many chunks
+    times = pd.date_range('2024-03-31 01:00', '2024-03-31 05:00', freq='7min').append(pd.date_range('2024-10-27 02:00', '2024-10-27 05:00', freq='7min'))
+    strings = pd.Series(times.strftime('%Y-%m-%d %H:%M'))
+    trade_data = pd.DataFrame({'Open Time': strings, 'Close Time': strings[::-1].values})
+    monkeypatch.setattr(helpers, 'TRADE_TIME_CHUNK_ROWS', 5)
+
+    normalized = helpers._normalize_trade_data(trade_data.copy(), '%Y-%m-%d %H:%M')
+    expected = helpers.convert_timezone(pd.to_datetime(strings), helpers.TRADE_SOURCE_TIMEZONE, helpers.DISPLAY_TIMEZONE)
+    assert (normalized['Open Time'].values == expected.values).all()
+    assert (normalized['Close Time'].values == expected.values[::-1]).all()
+    assert (normalized['Open DateTime'].values == expected.values).all()
@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from helpers import build_trade_index, parse_trade_number_input, select_trade_ranges
+
+def select_by_mask(trade_data, trade_ranges):
+    """Reference selection: tests every trade number against every range."""
+    numbers = trade_data['Trade Number'].values[:, None]
+    starts, ends, steps = trade_ranges.T
+    selected = ((numbers >= starts) & (numbers <= ends) & ((numbers - starts) % steps == 0)).any(axis=1)
+    return trade_data[selected].sort_values('Trade Number', kind='stable').reset_index(drop=True)
+
+@pytest.fixture
+def trade_data():
+    rng = np.random.default_rng(0)
+    # Two sources numbered independently, so every number appears twice, in shuffled order
+    numbers = rng.permutation(np.tile(np.arange(1, 301), 2))
+    return pd.DataFrame({'Trade Number': numbers, 'Profit': rng.normal(size=len(numbers))})
+
+@pytest.mark.parametrize('input_string', ['0', '5', '1-20, 24-25, 98', '290-', '0-300:7, 3-9', 'all', '10-20, 15-30, 31'])
+def test_select_trade_ranges_matches_mask(trade_data, input_string):
+    trade_ranges = parse_trade_number_input(input_string)
+    selected = select_trade_ranges(trade_data, build_trade_index(trade_data), trade_ranges)
+    pd.testing.assert_frame_equal(selected, select_by_mask(trade_data, trade_ranges))
+
+def test_select_trade_ranges_adds_row_columns(trade_data):
+    trade_index = build_trade_index(trade_data)
+    row_columns = {'Row': np.arange(len(trade_data))}
+    selected = select_trade_ranges(trade_data, trade_index, parse_trade_number_input('7'), ['Trade Number'], row_columns)
+    assert list(selected.columns) == ['Trade Number', 'Row']
+    assert sorted(selected['Row']) == list(np.flatnonzero(trade_data['Trade Number'].values == 7))